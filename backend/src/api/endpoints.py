@@ -6,7 +6,7 @@ import time
 from datetime import datetime
 from typing import Dict, Any
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from src.models.schemas import (
     LogDiagnosisRequest,
     LogDiagnosisResponse,
@@ -305,15 +305,16 @@ async def get_report(report_id: str):
     Get a specific JSON report by ID
     """
     try:
-        report_data = json_report_writer.get_report(report_id)
+        # Stored reports are already JSON; pass them through without re-encoding
+        report_bytes = json_report_writer.get_report_bytes(report_id)
         
-        if report_data is None:
+        if report_bytes is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Report not found: {report_id}"
             )
         
-        return report_data
+        return Response(content=report_bytes, media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
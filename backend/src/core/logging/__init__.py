@@ -1,7 +1,7 @@
 """
 Logging framework for Log Dawg
 """
-from .logger import LogDawgLogger, initialize_logging, get_logger, cleanup_logs, get_log_stats
+from .logger import LogDawgLogger, initialize_logging, get_logger, cleanup_logs, get_log_stats, shutdown_logging
 from .diagnosis_logger import DiagnosisLogger
 from .formatters import StructuredFormatter, DiagnosisFormatter
 from .handlers import DiagnosisFileHandler, RotatingFileHandler
@@ -16,5 +16,6 @@ __all__ = [
     'initialize_logging',
     'get_logger',
     'cleanup_logs',
-    'get_log_stats'
+    'get_log_stats',
+    'shutdown_logging'
 ]
@@ -1,52 +1,121 @@
 """
 Custom logging formatters for Log Dawg
 """
-import json
+import abc
 import logging
-from datetime import datetime
+import time
+import orjson
 from typing import Dict, Any, Optional
 
-class StructuredFormatter(logging.Formatter):
+# orjson handles datetimes natively; non-string keys are stringified like json.dumps
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+# Standard LogRecord attributes that are never copied into structured output
+_RESERVED_LOGRECORD_ATTRS = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
+    'filename', 'module', 'lineno', 'funcName', 'created',
+    'msecs', 'relativeCreated', 'thread', 'threadName',
+    'processName', 'process', 'message', 'exc_info', 'exc_text',
+    'stack_info'
+})
+
+# Attribute count of a LogRecord carrying no extras; records at or below this
+# size have nothing to copy, so the extras scan is skipped entirely
+_BASE_LOGRECORD_DICT_LEN = len(logging.LogRecord('', 0, '', 0, '', (), None).__dict__)
+
+# Diagnosis-specific extras, in output order
+_DIAGNOSIS_FIELDS = (
+    'diagnosis_id', 'step', 'category', 'duration_ms', 'correlation_id',
+    'provider', 'model', 'prompt_tokens', 'completion_tokens', 'total_tokens',
+    'git_commits_included', 'files_analyzed', 'confidence_score',
+    'api_response_code', 'retry_count', 'error_type'
+)
+_DIAGNOSIS_FIELDS_SET = frozenset(_DIAGNOSIS_FIELDS)
+
+# Fixed-key scaffolds for each formatter's base payload. Copying one reuses
+# its pre-sized hash table and fixes key order before values are filled in.
+_STRUCTURED_TEMPLATE = dict.fromkeys(
+    ('timestamp', 'level', 'logger', 'message', 'module', 'function', 'line')
+)
+_DIAGNOSIS_TEMPLATE = dict.fromkeys(('timestamp', 'level', 'message'))
+_PERFORMANCE_TEMPLATE = dict.fromkeys(
+    ('timestamp', 'event', 'duration_ms', 'memory_mb', 'cpu_percent')
+)
+
+# (epoch second, formatted prefix) of the most recently formatted timestamp.
+# Swapped as a single tuple so concurrent formatters never see a torn pair.
+_timestamp_cache = (None, '')
+
+def _format_timestamp(created: float) -> str:
+    """Format a record timestamp as ISO-8601 local time with microseconds"""
+    global _timestamp_cache
+    sec = int(created)
+    cached_sec, prefix = _timestamp_cache
+    if sec != cached_sec:
+        t = time.localtime(sec)
+        prefix = (
+            f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+            f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+        )
+        _timestamp_cache = (sec, prefix)
+    return f"{prefix}.{int((created - sec) * 1e6):06d}Z"
+
+class BaseJSONFormatter(logging.Formatter, metaclass=abc.ABCMeta):
+    """Base for formatters that serialize a per-record dict with orjson"""
+    
+    @abc.abstractmethod
+    def build_log_data(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """Build the dict to serialize for a log record"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """Format log record as a JSON string"""
+        return self.format_bytes(record, newline=False).decode('utf-8')
+    
+    def format_bytes(self, record: logging.LogRecord, newline: bool = True) -> bytes:
+        """Format log record as UTF-8 JSON bytes, newline-terminated by default"""
+        option = _ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE if newline else _ORJSON_OPTIONS
+        return orjson.dumps(
+            self.build_log_data(record), default=self._json_serializer, option=option
+        )
+    
+    def _json_serializer(self, obj):
+        """Handle objects orjson cannot serialize natively"""
+        return str(obj)
+
+class StructuredFormatter(BaseJSONFormatter):
     """JSON structured logging formatter"""
     
     def __init__(self):
         super().__init__()
     
-    def format(self, record: logging.LogRecord) -> str:
-        """Format log record as structured JSON"""
+    def build_log_data(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """Build the structured JSON payload for a log record"""
         
         # Base log structure
-        log_data = {
-            'timestamp': datetime.fromtimestamp(record.created).isoformat() + 'Z',
-            'level': record.levelname,
-            'logger': record.name,
-            'message': record.getMessage(),
-            'module': record.module,
-            'function': record.funcName,
-            'line': record.lineno
-        }
+        log_data = _STRUCTURED_TEMPLATE.copy()
+        log_data['timestamp'] = _format_timestamp(record.created)
+        log_data['level'] = record.levelname
+        log_data['logger'] = record.name
+        log_data['message'] = record.getMessage()
+        log_data['module'] = record.module
+        log_data['function'] = record.funcName
+        log_data['line'] = record.lineno
         
         # Add thread info if available
-        if hasattr(record, 'thread') and record.thread:
+        if record.thread:
             log_data['thread_id'] = record.thread
-            log_data['thread_name'] = getattr(record, 'threadName', '')
+            log_data['thread_name'] = record.threadName or ''
         
         # Add process info if available
-        if hasattr(record, 'process') and record.process:
+        if record.process:
             log_data['process_id'] = record.process
         
         # Add extra fields from LogRecord
-        extra_fields = {}
-        for key, value in record.__dict__.items():
-            if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 
-                          'filename', 'module', 'lineno', 'funcName', 'created', 
-                          'msecs', 'relativeCreated', 'thread', 'threadName', 
-                          'processName', 'process', 'message', 'exc_info', 'exc_text',
-                          'stack_info']:
-                extra_fields[key] = value
-        
-        if extra_fields:
-            log_data.update(extra_fields)
+        record_dict = record.__dict__
+        if len(record_dict) > _BASE_LOGRECORD_DICT_LEN:
+            for key, value in record_dict.items():
+                if key not in _RESERVED_LOGRECORD_ATTRS:
+                    log_data[key] = value
         
         # Add exception info if present
         if record.exc_info:
@@ -56,52 +125,39 @@ class StructuredFormatter(logging.Formatter):
         if record.stack_info:
             log_data['stack_info'] = record.stack_info
         
-        return json.dumps(log_data, default=self._json_serializer)
-    
-    def _json_serializer(self, obj):
-        """Handle non-serializable objects"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif hasattr(obj, '__dict__'):
-            return str(obj)
-        else:
-            return str(obj)
+        return log_data
 
-class DiagnosisFormatter(logging.Formatter):
+class DiagnosisFormatter(BaseJSONFormatter):
     """Specialized formatter for diagnosis logs"""
     
     def __init__(self):
         super().__init__()
     
-    def format(self, record: logging.LogRecord) -> str:
-        """Format diagnosis log record with rich context"""
+    def build_log_data(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """Build the diagnosis log payload with rich context"""
         
         # Base diagnosis log structure
-        log_data = {
-            'timestamp': datetime.fromtimestamp(record.created).isoformat() + 'Z',
-            'level': record.levelname,
-            'message': record.getMessage()
-        }
+        log_data = _DIAGNOSIS_TEMPLATE.copy()
+        log_data['timestamp'] = _format_timestamp(record.created)
+        log_data['level'] = record.levelname
+        log_data['message'] = record.getMessage()
         
         # Add diagnosis-specific fields
-        diagnosis_fields = [
-            'diagnosis_id', 'step', 'category', 'duration_ms', 'correlation_id',
-            'provider', 'model', 'prompt_tokens', 'completion_tokens', 'total_tokens',
-            'git_commits_included', 'files_analyzed', 'confidence_score',
-            'api_response_code', 'retry_count', 'error_type'
-        ]
-        
-        for field in diagnosis_fields:
-            if hasattr(record, field):
-                log_data[field] = getattr(record, field)
+        record_dict = record.__dict__
+        if not _DIAGNOSIS_FIELDS_SET.isdisjoint(record_dict):
+            for field in _DIAGNOSIS_FIELDS:
+                if field in record_dict:
+                    log_data[field] = record_dict[field]
         
         # Add metadata if present
-        if hasattr(record, 'metadata') and record.metadata:
-            log_data['metadata'] = record.metadata
+        metadata = record_dict.get('metadata')
+        if metadata:
+            log_data['metadata'] = metadata
         
         # Add performance metrics if present
-        if hasattr(record, 'performance') and record.performance:
-            log_data['performance'] = record.performance
+        performance = record_dict.get('performance')
+        if performance:
+            log_data['performance'] = performance
         
         # Add exception info if present
         if record.exc_info:
@@ -111,16 +167,7 @@ class DiagnosisFormatter(logging.Formatter):
                 'traceback': self.formatException(record.exc_info)
             }
         
-        return json.dumps(log_data, default=self._json_serializer)
-    
-    def _json_serializer(self, obj):
-        """Handle non-serializable objects"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif hasattr(obj, '__dict__'):
-            return str(obj)
-        else:
-            return str(obj)
+        return log_data
 
 class CompactFormatter(logging.Formatter):
     """Compact formatter for console output"""
@@ -133,51 +180,53 @@ class CompactFormatter(logging.Formatter):
     
     def format(self, record: logging.LogRecord) -> str:
         """Format with compact output"""
-        formatted = super().format(record)
-        
-        # Add diagnosis ID if present
-        if hasattr(record, 'diagnosis_id'):
-            formatted = f"[{record.diagnosis_id[:8]}] {formatted}"
+        # Built directly rather than through Formatter.format so the line is
+        # assembled in a single f-string; output matches the fmt/datefmt above
+        asctime = time.strftime(self.datefmt, self.converter(record.created))
+        message = record.getMessage()
+        
+        # Append exception and stack info as the base formatter would
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            message = f"{message}\n{record.exc_text}"
+        if record.stack_info:
+            message = f"{message}\n{self.formatStack(record.stack_info)}"
         
-        # Add step if present
-        if hasattr(record, 'step'):
-            formatted = f"{formatted} [{record.step}]"
+        # Add diagnosis ID and step if present
+        record_dict = record.__dict__
+        prefix = f"[{record_dict['diagnosis_id'][:8]}] " if 'diagnosis_id' in record_dict else ""
+        suffix = f" [{record_dict['step']}]" if 'step' in record_dict else ""
         
-        return formatted
+        return f"{prefix}{asctime} [{record.levelname}] {record.name}: {message}{suffix}"
 
-class PerformanceFormatter(logging.Formatter):
+class PerformanceFormatter(BaseJSONFormatter):
     """Specialized formatter for performance logs"""
     
     def __init__(self):
         super().__init__()
     
-    def format(self, record: logging.LogRecord) -> str:
-        """Format performance log record"""
+    def build_log_data(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """Build the performance log payload"""
         
-        log_data = {
-            'timestamp': datetime.fromtimestamp(record.created).isoformat() + 'Z',
-            'event': record.getMessage(),
-            'duration_ms': getattr(record, 'duration_ms', None),
-            'memory_mb': getattr(record, 'memory_mb', None),
-            'cpu_percent': getattr(record, 'cpu_percent', None)
-        }
+        record_dict = record.__dict__
+        log_data = _PERFORMANCE_TEMPLATE.copy()
+        log_data['timestamp'] = _format_timestamp(record.created)
+        log_data['event'] = record.getMessage()
+        log_data['duration_ms'] = record_dict.get('duration_ms')
+        log_data['memory_mb'] = record_dict.get('memory_mb')
+        log_data['cpu_percent'] = record_dict.get('cpu_percent')
         
         # Add diagnosis context if present
-        if hasattr(record, 'diagnosis_id'):
-            log_data['diagnosis_id'] = record.diagnosis_id
+        if 'diagnosis_id' in record_dict:
+            log_data['diagnosis_id'] = record_dict['diagnosis_id']
         
-        if hasattr(record, 'step'):
-            log_data['step'] = record.step
+        if 'step' in record_dict:
+            log_data['step'] = record_dict['step']
         
         # Add custom metrics if present
-        if hasattr(record, 'metrics') and record.metrics:
-            log_data['metrics'] = record.metrics
+        metrics = record_dict.get('metrics')
+        if metrics:
+            log_data['metrics'] = metrics
         
-        return json.dumps(log_data, default=self._json_serializer)
-    
-    def _json_serializer(self, obj):
-        """Handle non-serializable objects"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        else:
-            return str(obj)
+        return log_data
@@ -1,12 +1,39 @@
 """
 Custom logging handlers for Log Dawg
 """
+import copy
+import functools
 import logging
 import logging.handlers
+import os
+import sys
+import traceback
+from collections import defaultdict
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from .formatters import BaseJSONFormatter
+
+@functools.lru_cache(maxsize=128)
+def _ensure_directory(path: str):
+    """Create a directory tree once; repeat calls for the same path are free"""
+    os.makedirs(path, exist_ok=True)
+
+# Record category -> interned lowercase log type. Categories are a small fixed
+# vocabulary, so this avoids a lower() allocation per buffered record.
+_category_keys: Dict[str, str] = {}
+
+def _category_log_type(record: logging.LogRecord) -> str:
+    """Return the interned lowercase log type for a record's category"""
+    category = record.__dict__.get('category', 'general')
+    log_type = _category_keys.get(category)
+    if log_type is None:
+        log_type = sys.intern(category.lower())
+        if len(_category_keys) < 256:
+            _category_keys[category] = log_type
+    return log_type
+
 class RotatingFileHandler(logging.handlers.RotatingFileHandler):
     """Enhanced rotating file handler with additional features"""
     
@@ -37,7 +64,7 @@ class DiagnosisFileHandler(logging.FileHandler):
         # Create diagnosis-specific directory structure
         date_str = datetime.now().strftime('%Y-%m-%d')
         diagnosis_dir = self.log_dir / 'diagnoses' / date_str / f'diagnosis-{diagnosis_id}'
-        diagnosis_dir.mkdir(parents=True, exist_ok=True)
+        _ensure_directory(str(diagnosis_dir))
         
         # Set the log file path
         log_file = diagnosis_dir / f'{log_type}.log'
@@ -47,7 +74,7 @@ class DiagnosisFileHandler(logging.FileHandler):
     def emit(self, record: logging.LogRecord):
         """Emit a log record with diagnosis context"""
         # Add diagnosis ID to record if not present
-        if not hasattr(record, 'diagnosis_id'):
+        if 'diagnosis_id' not in record.__dict__:
             record.diagnosis_id = self.diagnosis_id
         
         try:
@@ -63,43 +90,60 @@ class BufferedDiagnosisHandler(logging.Handler):
         self.diagnosis_id = diagnosis_id
         self.log_dir = Path(log_dir)
         self.capacity = capacity
-        self.buffer = []
+        # Records are formatted on arrival and kept as lines grouped by log
+        # type, so the buffer does not pin whole LogRecord objects in memory
+        self.buffer: Dict[str, List[str]] = defaultdict(list)
+        self._total = 0
         self.handlers = {}
     
     def emit(self, record: logging.LogRecord):
-        """Buffer the log record"""
+        """Format and buffer the log record"""
         # Add diagnosis ID to record
-        if not hasattr(record, 'diagnosis_id'):
+        if 'diagnosis_id' not in record.__dict__:
             record.diagnosis_id = self.diagnosis_id
         
-        self.buffer.append(record)
+        try:
+            line = self.format(record) + '\n'
+        except Exception:
+            self.handleError(record)
+            return
+        
+        log_type = _category_log_type(record)
+        self.buffer[log_type].append(line)
+        self._total += 1
         
         # Flush if buffer is full
-        if len(self.buffer) >= self.capacity:
+        if self._total >= self.capacity:
             self.flush()
     
     def flush(self):
         """Flush all buffered records to appropriate files"""
-        if not self.buffer:
+        if not self._total:
             return
         
-        # Group records by log type
-        grouped_records = {}
-        for record in self.buffer:
-            log_type = getattr(record, 'category', 'general').lower()
-            if log_type not in grouped_records:
-                grouped_records[log_type] = []
-            grouped_records[log_type].append(record)
-        
-        # Write each group to its respective file
-        for log_type, records in grouped_records.items():
+        # Write each group to its respective file in a single batch
+        for log_type, lines in self.buffer.items():
             handler = self._get_handler(log_type)
-            for record in records:
-                handler.emit(record)
-            handler.flush()
+            self._write_batch(handler, lines)
         
         # Clear buffer
         self.buffer.clear()
+        self._total = 0
+    
+    def _write_batch(self, handler: DiagnosisFileHandler, lines: List[str]):
+        """Write pre-formatted lines with one writelines call"""
+        handler.acquire()
+        try:
+            if handler.stream is None:
+                handler.stream = handler._open()
+            handler.stream.writelines(lines)
+            handler.stream.flush()
+        except Exception:
+            # There is no single record to hand to handleError here
+            if logging.raiseExceptions:
+                traceback.print_exc(file=sys.stderr)
+        finally:
+            handler.release()
     
     def _get_handler(self, log_type: str) -> DiagnosisFileHandler:
         """Get or create handler for specific log type"""
@@ -144,28 +188,61 @@ class TimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
 class JSONFileHandler(logging.FileHandler):
     """File handler that writes JSON logs"""
     
+    # Records written between explicit flushes; WARNING and above flush immediately
+    flush_interval = 64
+    
     def __init__(self, filename: str, mode: str = 'a', encoding: str = 'utf-8', delay: bool = False):
         # Ensure directory exists
         Path(filename).parent.mkdir(parents=True, exist_ok=True)
         
+        self._writes_since_flush = 0
         super().__init__(filename, mode, encoding, delay)
     
+    def _open(self):
+        """Open the log file in binary mode with a block buffer so writes are batched"""
+        return open(self.baseFilename, self.mode.replace('b', '') + 'b', buffering=8192)
+    
     def emit(self, record: logging.LogRecord):
         """Emit a JSON formatted log record"""
         try:
-            # Format the record
-            formatted_record = self.format(record)
+            # JSON formatters serialize straight to newline-terminated bytes;
+            # anything else is formatted as text and encoded
+            formatter = self.formatter
+            if isinstance(formatter, BaseJSONFormatter):
+                data = formatter.format_bytes(record)
+            else:
+                data = (self.format(record) + '\n').encode(self.encoding)
             
             # Write to file
             if self.stream is None:
                 self.stream = self._open()
             
-            self.stream.write(formatted_record + '\n')
-            self.flush()
+            self.stream.write(data)
+            self._writes_since_flush += 1
+            
+            if (record.levelno >= logging.WARNING or
+                    self._writes_since_flush >= self.flush_interval):
+                self.flush()
+                self._writes_since_flush = 0
             
         except Exception:
             self.handleError(record)
 
+def _level_file_key(record: logging.LogRecord) -> str:
+    return record.levelname.lower()
+
+def _category_file_key(record: logging.LogRecord) -> str:
+    return _category_log_type(record)
+
+def _default_file_key(record: logging.LogRecord) -> str:
+    return 'default'
+
+# MultiFileHandler split_by value -> file key function, resolved once per handler
+_SPLIT_KEY_FUNCS = {
+    'level': _level_file_key,
+    'category': _category_file_key,
+}
+
 class MultiFileHandler(logging.Handler):
     """Handler that writes to multiple files based on log level or category"""
     
@@ -173,21 +250,15 @@ class MultiFileHandler(logging.Handler):
         super().__init__()
         self.base_path = Path(base_path)
         self.split_by = split_by  # 'level' or 'category'
+        self._key_fn = _SPLIT_KEY_FUNCS.get(split_by, _default_file_key)
         self.handlers = {}
     
     def emit(self, record: logging.LogRecord):
         """Emit record to appropriate file based on splitting criteria"""
         try:
-            # Determine the file key
-            if self.split_by == 'level':
-                file_key = record.levelname.lower()
-            elif self.split_by == 'category':
-                file_key = getattr(record, 'category', 'general').lower()
-            else:
-                file_key = 'default'
-            
-            # Get or create handler for this key
-            handler = self._get_handler(file_key)
+            # Get or create handler for this record's file key
+            file_key = self._key_fn(record)
+            handler = self.handlers.get(file_key) or self._get_handler(file_key)
             handler.emit(record)
             
         except Exception:
@@ -215,3 +286,18 @@ class MultiFileHandler(logging.Handler):
         for handler in self.handlers.values():
             handler.close()
         super().close()
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler for in-process listeners that keeps exception info intact"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge args into the message but leave exc_info for downstream formatters"""
+        # The stock QueueHandler renders the record with a plain Formatter and
+        # drops exc_info, which would flatten tracebacks into the message of
+        # structured logs. The listener runs in this process, so the record
+        # does not need to be pickle-safe.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
@@ -1,15 +1,27 @@
 """
 Main logging configuration for Log Dawg
 """
+import atexit
 import logging
 import logging.handlers
+import os
+import queue
+import shutil
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from .formatters import StructuredFormatter
-from .handlers import RotatingFileHandler
+from .handlers import RotatingFileHandler, LocalQueueHandler
+
+
+# (logger name, file under <log_dir>/system) for each specialized system logger
+_SYSTEM_LOGGERS = (
+    ('api', 'api.log'),
+    ('health', 'health.log'),
+    ('performance', 'performance.log'),
+)
 
 
 class LogDawgLogger:
@@ -25,6 +37,10 @@ class LogDawgLogger:
         (self.log_dir / 'diagnoses').mkdir(exist_ok=True)
         
         self._loggers: Dict[str, logging.Logger] = {}
+        # (logger, listener) for each queued logger; after shutdown the
+        # listener's handlers are attached to the logger directly instead
+        self._listeners: List[Tuple[logging.Logger, logging.handlers.QueueListener]] = []
+        self._direct_handlers: List[Tuple[logging.Logger, logging.Handler]] = []
         self._setup_root_logger()
         self._setup_system_loggers()
     
@@ -35,6 +51,7 @@ class LogDawgLogger:
         
         # Clear any existing handlers
         root_logger.handlers.clear()
+        handlers = []
         
         # Console handler
         if self.config.get('console_logging', True):
@@ -44,7 +61,7 @@ class LogDawgLogger:
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
             console_handler.setFormatter(console_formatter)
-            root_logger.addHandler(console_handler)
+            handlers.append(console_handler)
         
         # File handler for general application logs
         if self.config.get('file_logging', True):
@@ -64,60 +81,74 @@ class LogDawgLogger:
                 )
             
             app_handler.setFormatter(app_formatter)
-            root_logger.addHandler(app_handler)
+            handlers.append(app_handler)
+        
+        if handlers:
+            self._attach_queue(root_logger, *handlers)
         
         self._loggers['root'] = root_logger
     
     def _setup_system_loggers(self):
         """Setup specialized system loggers"""
+        max_bytes = self.config.get('max_log_size_mb', 50) * 1024 * 1024
         
-        # API Logger
-        api_logger = logging.getLogger('logdawg.api')
-        api_logger.setLevel(logging.INFO)
-        api_logger.propagate = False
-        
-        api_log_path = self.log_dir / 'system' / 'api.log'
-        api_handler = RotatingFileHandler(
-            str(api_log_path),
-            maxBytes=self.config.get('max_log_size_mb', 50) * 1024 * 1024,
-            backupCount=5
-        )
-        api_handler.setFormatter(StructuredFormatter())
-        api_logger.addHandler(api_handler)
-        
-        self._loggers['api'] = api_logger
+        # Formatters are stateless, so one instance serves every system log
+        formatter = StructuredFormatter()
         
-        # Health Logger
-        health_logger = logging.getLogger('logdawg.health')
-        health_logger.setLevel(logging.INFO)
-        health_logger.propagate = False
+        for name, filename in _SYSTEM_LOGGERS:
+            system_logger = logging.getLogger(f'logdawg.{name}')
+            system_logger.setLevel(logging.INFO)
+            system_logger.propagate = False
+            
+            handler = RotatingFileHandler(
+                str(self.log_dir / 'system' / filename),
+                maxBytes=max_bytes,
+                backupCount=5
+            )
+            handler.setFormatter(formatter)
+            self._attach_queue(system_logger, handler)
+            
+            self._loggers[name] = system_logger
+    
+    def _attach_queue(self, logger: logging.Logger, *handlers: logging.Handler):
+        """Route a logger through a queue so its handlers run on a listener thread"""
+        log_queue = queue.Queue(-1)
+        logger.addHandler(LocalQueueHandler(log_queue))
         
-        health_log_path = self.log_dir / 'system' / 'health.log'
-        health_handler = RotatingFileHandler(
-            str(health_log_path),
-            maxBytes=self.config.get('max_log_size_mb', 50) * 1024 * 1024,
-            backupCount=5
+        listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
         )
-        health_handler.setFormatter(StructuredFormatter())
-        health_logger.addHandler(health_handler)
+        listener.start()
+        self._listeners.append((logger, listener))
+    
+    def shutdown(self, close_handlers: bool = False):
+        """Drain queued records and stop all listener threads
         
-        self._loggers['health'] = health_logger
+        Loggers keep working afterwards: each listener's handlers are
+        attached to its logger directly and emit synchronously. With
+        close_handlers those handlers are detached and closed instead,
+        for when this configuration is being replaced.
+        """
+        for logger in self._loggers.values():
+            for handler in logger.handlers[:]:
+                if isinstance(handler, LocalQueueHandler):
+                    logger.removeHandler(handler)
         
-        # Performance Logger
-        perf_logger = logging.getLogger('logdawg.performance')
-        perf_logger.setLevel(logging.INFO)
-        perf_logger.propagate = False
+        while self._listeners:
+            logger, listener = self._listeners.pop()
+            listener.stop()
+            for handler in listener.handlers:
+                if close_handlers:
+                    handler.close()
+                else:
+                    logger.addHandler(handler)
+                    self._direct_handlers.append((logger, handler))
         
-        perf_log_path = self.log_dir / 'system' / 'performance.log'
-        perf_handler = RotatingFileHandler(
-            str(perf_log_path),
-            maxBytes=self.config.get('max_log_size_mb', 50) * 1024 * 1024,
-            backupCount=5
-        )
-        perf_handler.setFormatter(StructuredFormatter())
-        perf_logger.addHandler(perf_handler)
-        
-        self._loggers['performance'] = perf_logger
+        if close_handlers:
+            while self._direct_handlers:
+                logger, handler = self._direct_handlers.pop()
+                logger.removeHandler(handler)
+                handler.close()
     
     def get_logger(self, name: str = 'root') -> logging.Logger:
         """Get a logger by name"""
@@ -139,27 +170,37 @@ class LogDawgLogger:
         retention_days = retention_days or self.config.get('retention_days', 30)
         cutoff_time = datetime.now().timestamp() - (retention_days * 24 * 3600)
         
-        # Clean up system logs
+        # Clean up system logs. Expired entries are selected in one pass over
+        # the cached DirEntry stats before anything is removed.
         system_log_dir = self.log_dir / 'system'
-        for log_file in system_log_dir.glob('*.log*'):
-            if log_file.stat().st_mtime < cutoff_time:
-                try:
-                    log_file.unlink()
-                    self.get_logger().info(f"Removed old log file: {log_file}")
-                except Exception as e:
-                    self.get_logger().error(f"Failed to remove old log file {log_file}: {e}")
+        with os.scandir(system_log_dir) as entries:
+            expired_files = [
+                entry.path for entry in entries
+                if '.log' in entry.name and entry.is_file()
+                and entry.stat().st_mtime < cutoff_time
+            ]
+        
+        for path in expired_files:
+            try:
+                os.unlink(path)
+                self.get_logger().info(f"Removed old log file: {path}")
+            except Exception as e:
+                self.get_logger().error(f"Failed to remove old log file {path}: {e}")
         
         # Clean up diagnosis logs
         diagnoses_dir = self.log_dir / 'diagnoses'
-        for date_dir in diagnoses_dir.iterdir():
-            if date_dir.is_dir():
-                if date_dir.stat().st_mtime < cutoff_time:
-                    try:
-                        import shutil
-                        shutil.rmtree(date_dir)
-                        self.get_logger().info(f"Removed old diagnosis log directory: {date_dir}")
-                    except Exception as e:
-                        self.get_logger().error(f"Failed to remove old diagnosis log directory {date_dir}: {e}")
+        with os.scandir(diagnoses_dir) as entries:
+            expired_dirs = [
+                entry.path for entry in entries
+                if entry.is_dir() and entry.stat().st_mtime < cutoff_time
+            ]
+        
+        for path in expired_dirs:
+            try:
+                shutil.rmtree(path)
+                self.get_logger().info(f"Removed old diagnosis log directory: {path}")
+            except Exception as e:
+                self.get_logger().error(f"Failed to remove old diagnosis log directory {path}: {e}")
     
     def get_log_stats(self) -> Dict[str, Any]:
         """Get statistics about log files"""
@@ -169,17 +210,19 @@ class LogDawgLogger:
             'total_size_mb': 0
         }
         
-        # System log stats
+        # System log stats; DirEntry.stat() is cached, so each file is stat'd once
         system_log_dir = self.log_dir / 'system'
         if system_log_dir.exists():
-            for log_file in system_log_dir.glob('*.log'):
-                if log_file.is_file():
-                    size_mb = log_file.stat().st_size / (1024 * 1024)
-                    stats['system_logs'][log_file.name] = {
-                        'size_mb': round(size_mb, 2),
-                        'modified': datetime.fromtimestamp(log_file.stat().st_mtime)
-                    }
-                    stats['total_size_mb'] += size_mb
+            with os.scandir(system_log_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.log') and entry.is_file():
+                        stat = entry.stat()
+                        size_mb = stat.st_size / (1024 * 1024)
+                        stats['system_logs'][entry.name] = {
+                            'size_mb': round(size_mb, 2),
+                            'modified': datetime.fromtimestamp(stat.st_mtime)
+                        }
+                        stats['total_size_mb'] += size_mb
         
         # Diagnosis log stats
         diagnoses_dir = self.log_dir / 'diagnoses'
@@ -187,14 +230,20 @@ class LogDawgLogger:
             diagnosis_count = 0
             diagnosis_size = 0
             
-            for date_dir in diagnoses_dir.iterdir():
-                if date_dir.is_dir():
-                    for diagnosis_dir in date_dir.iterdir():
-                        if diagnosis_dir.is_dir():
+            with os.scandir(diagnoses_dir) as date_entries:
+                for date_entry in date_entries:
+                    if not date_entry.is_dir():
+                        continue
+                    with os.scandir(date_entry.path) as diagnosis_entries:
+                        for diagnosis_entry in diagnosis_entries:
+                            if not diagnosis_entry.is_dir():
+                                continue
                             diagnosis_count += 1
-                            for log_file in diagnosis_dir.glob('*.log'):
-                                if log_file.is_file():
-                                    diagnosis_size += log_file.stat().st_size
+                            with os.scandir(diagnosis_entry.path) as log_entries:
+                                diagnosis_size += sum(
+                                    log_entry.stat().st_size for log_entry in log_entries
+                                    if log_entry.name.endswith('.log') and log_entry.is_file()
+                                )
             
             stats['diagnosis_logs'] = {
                 'count': diagnosis_count,
@@ -208,15 +257,28 @@ class LogDawgLogger:
 
 # Global logger instance
 _logger_instance: Optional[LogDawgLogger] = None
+_atexit_registered = False
 
 
 def initialize_logging(config: Dict[str, Any]) -> LogDawgLogger:
     """Initialize the global logging configuration"""
-    global _logger_instance
+    global _logger_instance, _atexit_registered
+    if _logger_instance is not None:
+        _logger_instance.shutdown(close_handlers=True)
     _logger_instance = LogDawgLogger(config)
+    
+    if not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
     return _logger_instance
 
 
+def shutdown_logging():
+    """Flush queued log records and stop background logging threads"""
+    if _logger_instance:
+        _logger_instance.shutdown()
+
+
 def get_logger(name: str = 'root') -> logging.Logger:
     """Get a logger instance"""
     if _logger_instance is None:
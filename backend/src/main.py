@@ -10,7 +10,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from src.api.endpoints import router
 from src.core.config import config_manager
-from src.core.logging import initialize_logging, get_logger
+from src.core.logging import initialize_logging, get_logger, shutdown_logging
 from src import __version__
 
 # Initialize the logging system
@@ -60,6 +60,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Log Dawg")
+    shutdown_logging()
 
 # Create FastAPI application
 app = FastAPI(
@@ -84,14 +85,21 @@ app.add_middleware(
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all incoming requests"""
-    start_time = time.time()
+    if not logger.isEnabledFor(logging.INFO):
+        return await call_next(request)
     
-    logger.info(f"Request: {request.method} {request.url}")
+    start_time = time.perf_counter()
+    
+    # %-style arguments defer str(request.url) until the record is formatted
+    logger.info("Request: %s %s", request.method, request.url)
     
     response = await call_next(request)
     
-    process_time = time.time() - start_time
-    logger.info(f"Response: {response.status_code} - {process_time:.3f}s")
+    process_time = time.perf_counter() - start_time
+    logger.info(
+        "Response: %s - %.3fs", response.status_code, process_time,
+        extra={'status_code': response.status_code, 'duration_ms': process_time * 1000}
+    )
     
     return response
 
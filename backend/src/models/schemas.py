@@ -2,18 +2,31 @@
 Pydantic schemas for API requests and responses
 """
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Union
-from pydantic import BaseModel, Field
+from typing import Annotated, Dict, Any, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, Tag
 
 class CodeSnippet(BaseModel):
     """Represents a snippet of code from a file"""
+    model_config = ConfigDict(frozen=True)
+
     start_line: int = Field(..., description="Starting line number of the snippet")
     end_line: int = Field(..., description="Ending line number of the snippet")
     content: str = Field(..., description="The actual code snippet content")
 
+def _log_content_kind(value: Any) -> str:
+    """Pick the log content branch from the input type"""
+    return 'text' if isinstance(value, str) else 'json'
+
+# Plain text or a JSON object; the discriminator dispatches straight to one
+# branch instead of trying each union member in turn
+LogContent = Annotated[
+    Union[Annotated[str, Tag('text')], Annotated[Dict[str, Any], Tag('json')]],
+    Discriminator(_log_content_kind)
+]
+
 class LogData(BaseModel):
     """Schema for incoming log data"""
-    content: Union[str, Dict[str, Any]] = Field(..., description="Log content - can be JSON object or plain text")
+    content: LogContent = Field(..., description="Log content - can be JSON object or plain text")
     source: Optional[str] = Field(None, description="Source of the log (e.g., 'cloudwatch', 'alb')")
     timestamp: Optional[datetime] = Field(None, description="Log timestamp")
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata")
@@ -53,12 +66,6 @@ class FileContentInfo(BaseModel):
     relevance_score: Optional[float] = None
     selection_reason: Optional[str] = None
 
-    class Config:
-        json_encoders = {
-            # Ensure proper serialization
-            CodeSnippet: lambda v: v.dict() if hasattr(v, 'dict') else v
-        }
-
 class ContextDiscoveryRequest(BaseModel):
     """Request for context discovery from LLM"""
     error_message: str
@@ -131,11 +138,13 @@ class ParsedLogEntry(BaseModel):
     source: Optional[str]
     stack_trace: Optional[str]
     service_name: Optional[str]
-    raw_content: Union[str, Dict[str, Any]]
+    raw_content: LogContent
     extracted_errors: List[str]
 
 class GitCommitInfo(BaseModel):
     """Git commit information"""
+    model_config = ConfigDict(frozen=True)
+
     hash: str
     author: str
     date: datetime
@@ -153,6 +162,8 @@ class IntermediateReport(BaseModel):
 
 class LLMProvider(BaseModel):
     """LLM provider configuration"""
+    model_config = ConfigDict(frozen=True)
+
     name: str
     model: str
     api_key: Optional[str] = None
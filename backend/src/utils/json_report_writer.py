@@ -1,14 +1,86 @@
 """
 JSON report writer for log diagnosis results
 """
-import json
+import base64
+import heapq
+import os
+import re
+import threading
 import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+import orjson
+from pydantic import BaseModel, TypeAdapter
 from src.models.schemas import LogDiagnosisResponse, DiagnosisResult, GitInfo, ParsedLogEntry
 from src.core.config import config_manager
 
+# Reports are stored compact (no indentation whitespace); non-string keys in
+# raw log content are stringified
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Full file contents and the context discovery trace are not persisted in reports
+_DIAGNOSIS_RESULT_EXCLUDE = {
+    'context_discovery': True,
+    'relevant_code_files': {'__all__': {'content'}},
+}
+
+def _new_report_id() -> str:
+    """Generate a 22-character URL-safe report ID from a random UUID"""
+    return base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b'=').decode('ascii')
+
+def _created_key(entry: Dict[str, Any]) -> float:
+    """Sort key for index entries"""
+    return entry["created"]
+
+def _write_bytes(path: Path, data: bytes):
+    """Write a payload with unbuffered os.write calls (normally just one)"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+class ReportMetadataSummary(BaseModel):
+    """Report metadata fields needed for listings"""
+    diagnosis_id: Optional[str] = None
+    timestamp: Optional[str] = None
+    processing_time_seconds: Optional[float] = 0.0
+
+class DiagnosisSummary(BaseModel):
+    """Diagnosis result fields needed for listings"""
+    title: Optional[str] = 'Unknown Error'
+    error_type: Optional[str] = 'Unknown'
+    summary: Optional[str] = ''
+    confidence_score: Optional[float] = None
+
+class ReportSummary(BaseModel):
+    """Subset of a stored report read by list_reports and get_report_stats"""
+    metadata: ReportMetadataSummary = ReportMetadataSummary()
+    diagnosis_result: DiagnosisSummary = DiagnosisSummary()
+
+# Built once; validate_json parses and validates report bytes in one pass
+_REPORT_SUMMARY_ADAPTER = TypeAdapter(ReportSummary)
+
+# Report IDs are 16 random bytes as unpadded URL-safe base64 (22 chars);
+# older reports use the 36-char UUID string form
+_REPORT_ID_RE = re.compile(r'[A-Za-z0-9_-]{22}')
+
+# Sentence boundaries for summary previews
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+# Sidecar holding one summary line per report (plus delete tombstones)
+INDEX_FILENAME = "index.jsonl"
+
+# Number of saves between old-report cleanups (and index compactions)
+CLEANUP_INTERVAL = 50
+
+# Worker threads used to read report files when rebuilding the index
+SCAN_WORKERS = 8
+
 class JsonReportWriter:
     """Generates and manages JSON reports for log diagnosis results"""
     
@@ -16,6 +88,11 @@ class JsonReportWriter:
         self.config = config_manager.config
         self.reports_dir = Path(self.config.reports.output_dir)
         self.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.reports_dir / INDEX_FILENAME
+        self._index_lock = threading.Lock()
+        self._saves_since_cleanup = 0
+        # Replayed index keyed by the index file's (inode, mtime_ns, size)
+        self._index_cache: Optional[Tuple[Tuple[int, int, int], Dict[str, Dict[str, Any]]]] = None
     
     def save_report(
         self, 
@@ -25,7 +102,7 @@ class JsonReportWriter:
         """Save a diagnosis report as JSON and return the report ID"""
         
         # Generate unique report ID
-        report_id = str(uuid.uuid4())
+        report_id = _new_report_id()
         
         # Create JSON report structure
         json_report = self._build_json_report(diagnosis_response, parsed_log, report_id)
@@ -35,99 +112,79 @@ class JsonReportWriter:
         report_path = self.reports_dir / filename
         
         # Write JSON to file
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(json_report, f, indent=2, ensure_ascii=False, default=str)
+        _write_bytes(report_path, orjson.dumps(json_report, default=str, option=_ORJSON_OPTIONS))
+        
+        # Record the summary so listings don't have to re-read the report
+        self._append_index(self._index_entry(
+            report_id,
+            report_path.stat(),
+            json_report["metadata"],
+            json_report["diagnosis_result"]
+        ))
         
-        # Clean up old reports if needed
-        self._cleanup_old_reports()
+        # Clean up old reports periodically rather than on every save
+        self._saves_since_cleanup += 1
+        if self._saves_since_cleanup >= CLEANUP_INTERVAL:
+            self._saves_since_cleanup = 0
+            self._cleanup_old_reports()
         
         return report_id
     
     def get_report(self, report_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific report by ID"""
-        filename = f"report_{report_id}.json"
-        report_path = self.reports_dir / filename
+        report_bytes = self.get_report_bytes(report_id)
+        if report_bytes is None:
+            return None
         
-        if not report_path.exists():
+        try:
+            return orjson.loads(report_bytes)
+        except orjson.JSONDecodeError as e:
+            print(f"Error reading report {report_id}: {e}")
+            return None
+    
+    def get_report_bytes(self, report_id: str) -> Optional[bytes]:
+        """Get a specific report's stored JSON bytes by ID, without parsing"""
+        report_path = self._report_path(report_id)
+        if report_path is None:
             return None
         
         try:
-            with open(report_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, Exception) as e:
+            return report_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
             print(f"Error reading report {report_id}: {e}")
             return None
     
     def list_reports(self, limit: int = 20) -> List[Dict[str, Any]]:
         """List recent reports with metadata"""
-        report_files = []
+        # Only the newest `limit` entries are needed, so avoid a full sort
+        newest = heapq.nlargest(limit, self._read_index().values(), key=_created_key)
         
-        for file_path in self.reports_dir.glob("report_*.json"):
-            if file_path.is_file():
-                try:
-                    # Extract report ID from filename
-                    report_id = file_path.stem.replace('report_', '')
-                    
-                    # Get file stats
-                    stat = file_path.stat()
-                    
-                    # Load report for metadata
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        report_data = json.load(f)
-                    
-                    # Extract key metadata
-                    metadata = report_data.get('metadata', {})
-                    diagnosis_result = report_data.get('diagnosis_result', {})
-                    
-                    report_info = {
-                        "report_id": report_id,
-                        "filename": file_path.name,  # Keep for compatibility
-                        "path": str(file_path),
-                        "size_bytes": stat.st_size,
-                        "created": datetime.fromtimestamp(stat.st_ctime),
-                        "modified": datetime.fromtimestamp(stat.st_mtime),
-                        "display_title": diagnosis_result.get('title', 'Unknown Error'),
-                        "error_type": diagnosis_result.get('error_type', 'Unknown'),
-                        "confidence_score": diagnosis_result.get('confidence_score', 0.0),
-                        "processing_time": metadata.get('processing_time_seconds', 0.0),
-                        "summary_preview": self._generate_summary_preview(
-                            diagnosis_result.get('summary', '')
-                        ),
-                        "diagnosis_id": metadata.get('diagnosis_id'),
-                        "timestamp": metadata.get('timestamp')
-                    }
-                    
-                    report_files.append(report_info)
-                    
-                except Exception as e:
-                    print(f"Error processing report file {file_path.name}: {e}")
-                    continue
-        
-        # Sort by creation time (newest first)
-        report_files.sort(key=lambda x: x["created"], reverse=True)
-        
-        return report_files[:limit]
+        return [self._report_info(entry) for entry in newest]
     
     def delete_report(self, report_id: str) -> bool:
         """Delete a specific report"""
-        filename = f"report_{report_id}.json"
-        report_path = self.reports_dir / filename
-        
-        if not report_path.exists():
+        report_path = self._report_path(report_id)
+        if report_path is None:
             return False
         
         try:
             report_path.unlink()
-            return True
+        except FileNotFoundError:
+            return False
         except Exception as e:
             print(f"Error deleting report {report_id}: {e}")
             return False
+        
+        self._append_index({"report_id": report_path.stem[len("report_"):], "deleted": True})
+        return True
     
     def get_report_stats(self) -> Dict[str, Any]:
         """Get statistics about reports"""
-        report_files = list(self.reports_dir.glob("report_*.json"))
+        entries = self._read_index()
         
-        if not report_files:
+        if not entries:
             return {
                 "total_reports": 0,
                 "total_size_mb": 0,
@@ -137,41 +194,61 @@ class JsonReportWriter:
                 "average_confidence_score": 0
             }
         
-        total_size = sum(f.stat().st_size for f in report_files)
-        creation_times = [f.stat().st_ctime for f in report_files]
+        # "Today" is compared as a local-midnight timestamp range rather than
+        # per-entry dates
+        today_start = datetime.combine(date.today(), time.min)
+        today_start_ts = today_start.timestamp()
+        tomorrow_start_ts = (today_start + timedelta(days=1)).timestamp()
         
-        # Calculate reports today and average confidence
-        today = datetime.now().date()
+        # Accumulate every statistic in a single pass over the index
+        total_size = 0
+        oldest = newest = None
         reports_today = 0
-        confidence_scores = []
+        confidence_total = 0.0
+        confidence_count = 0
         
-        for report_file in report_files:
+        for entry in entries.values():
+            total_size += entry["size_bytes"]
+            
+            created = entry["created"]
+            if oldest is None or created < oldest:
+                oldest = created
+            if newest is None or created > newest:
+                newest = created
+            
             # Check if report was created today
-            file_date = datetime.fromtimestamp(report_file.stat().st_ctime).date()
-            if file_date == today:
+            if today_start_ts <= created < tomorrow_start_ts:
                 reports_today += 1
             
-            # Try to get confidence score
-            try:
-                with open(report_file, 'r', encoding='utf-8') as f:
-                    report_data = json.load(f)
-                    confidence = report_data.get('diagnosis_result', {}).get('confidence_score')
-                    if confidence is not None:
-                        confidence_scores.append(confidence)
-            except Exception:
-                continue
+            # Running sum; index entries always carry the key (None if unknown)
+            confidence = entry["confidence_score"]
+            if confidence is not None:
+                confidence_total += confidence
+                confidence_count += 1
         
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
+        avg_confidence = confidence_total / confidence_count if confidence_count else 0
         
         return {
-            "total_reports": len(report_files),
+            "total_reports": len(entries),
             "total_size_mb": total_size / (1024 * 1024),
-            "oldest_report": datetime.fromtimestamp(min(creation_times)),
-            "newest_report": datetime.fromtimestamp(max(creation_times)),
+            "oldest_report": datetime.fromtimestamp(oldest),
+            "newest_report": datetime.fromtimestamp(newest),
             "reports_today": reports_today,
             "average_confidence_score": round(avg_confidence * 100, 1)
         }
     
+    def _report_path(self, report_id: str) -> Optional[Path]:
+        """Resolve a report ID to its file path, or None if it is not a valid ID"""
+        if isinstance(report_id, str) and _REPORT_ID_RE.fullmatch(report_id):
+            return self.reports_dir / f"report_{report_id}.json"
+        
+        try:
+            # Legacy UUID IDs, in canonical form; also rejects path separators
+            canonical_id = str(uuid.UUID(report_id))
+        except (ValueError, TypeError, AttributeError):
+            return None
+        return self.reports_dir / f"report_{canonical_id}.json"
+    
     def _build_json_report(
         self, 
         diagnosis_response: LogDiagnosisResponse,
@@ -180,69 +257,167 @@ class JsonReportWriter:
     ) -> Dict[str, Any]:
         """Build the complete JSON report structure"""
         
+        # pydantic-core walks the model trees; datetimes are left as objects
+        # for orjson to encode natively when the report is written
         return {
             "report_id": report_id,
             "version": "2.0",  # JSON-first version
             "metadata": {
                 "diagnosis_id": diagnosis_response.diagnosis_id,
-                "timestamp": diagnosis_response.timestamp.isoformat(),
+                "timestamp": diagnosis_response.timestamp,
                 "processing_time_seconds": diagnosis_response.processing_time_seconds,
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": datetime.now(),
                 "format": "json"
             },
-            "diagnosis_result": {
-                "title": diagnosis_response.diagnosis_result.title,
-                "error_type": diagnosis_response.diagnosis_result.error_type,
-                "summary": diagnosis_response.diagnosis_result.summary,
-                "root_cause": diagnosis_response.diagnosis_result.root_cause,
-                "error_analysis": diagnosis_response.diagnosis_result.error_analysis,
-                "recommendations": diagnosis_response.diagnosis_result.recommendations,
-                "confidence_score": diagnosis_response.diagnosis_result.confidence_score,
-                "relevant_code_files": [
-                    {
-                        "file_path": f.file_path,
-                        "size_kb": f.size_kb,
-                        "snippets": [
-                            {
-                                "start_line": snippet.start_line,
-                                "end_line": snippet.end_line,
-                                "content": snippet.content
-                            }
-                            for snippet in (f.snippets or [])
-                        ],
-                        "relevance_score": f.relevance_score,
-                        "selection_reason": f.selection_reason
-                    }
-                    for f in (diagnosis_response.diagnosis_result.relevant_code_files or [])
-                ]
-            },
-            "git_info": {
-                "branch": diagnosis_response.git_info.branch,
-                "current_commit": diagnosis_response.git_info.current_commit,
-                "last_pull_time": diagnosis_response.git_info.last_pull_time.isoformat(),
-                "recent_commits": diagnosis_response.git_info.recent_commits,
-                "changed_files": diagnosis_response.git_info.changed_files
-            },
-            "parsed_log": {
-                "timestamp": parsed_log.timestamp.isoformat() if parsed_log.timestamp else None,
-                "level": parsed_log.level,
-                "message": parsed_log.message,
-                "source": parsed_log.source,
-                "service_name": parsed_log.service_name,
-                "stack_trace": parsed_log.stack_trace,
-                "extracted_errors": parsed_log.extracted_errors,
-                "raw_content": parsed_log.raw_content
-            }
+            "diagnosis_result": diagnosis_response.diagnosis_result.model_dump(
+                exclude=_DIAGNOSIS_RESULT_EXCLUDE
+            ),
+            "git_info": diagnosis_response.git_info.model_dump(),
+            "parsed_log": parsed_log.model_dump()
+        }
+    
+    def _index_entry(
+        self,
+        report_id: str,
+        stat: os.stat_result,
+        metadata: Dict[str, Any],
+        diagnosis_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the index line stored for a report"""
+        return {
+            "report_id": report_id,
+            "size_bytes": stat.st_size,
+            "created": stat.st_ctime,
+            "modified": stat.st_mtime,
+            "display_title": diagnosis_result.get('title', 'Unknown Error'),
+            "error_type": diagnosis_result.get('error_type', 'Unknown'),
+            "confidence_score": diagnosis_result.get('confidence_score'),
+            "processing_time": metadata.get('processing_time_seconds', 0.0),
+            "summary_preview": self._generate_summary_preview(
+                diagnosis_result.get('summary', '')
+            ),
+            "diagnosis_id": metadata.get('diagnosis_id'),
+            "timestamp": metadata.get('timestamp')
         }
     
+    def _report_info(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Expand an index entry into the list_reports item shape"""
+        filename = f"report_{entry['report_id']}.json"
+        return {
+            "report_id": entry["report_id"],
+            "filename": filename,  # Keep for compatibility
+            "path": str(self.reports_dir / filename),
+            "size_bytes": entry["size_bytes"],
+            "created": datetime.fromtimestamp(entry["created"]),
+            "modified": datetime.fromtimestamp(entry["modified"]),
+            "display_title": entry["display_title"],
+            "error_type": entry["error_type"],
+            "confidence_score": entry["confidence_score"] or 0.0,
+            "processing_time": entry["processing_time"],
+            "summary_preview": entry["summary_preview"],
+            "diagnosis_id": entry["diagnosis_id"],
+            "timestamp": entry["timestamp"]
+        }
+    
+    def _append_index(self, entry: Dict[str, Any]):
+        """Append one entry (or tombstone) to the index"""
+        line = orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE)
+        with self._index_lock:
+            if not self.index_path.exists():
+                # A fresh scan already reflects this save or delete
+                self._write_index(self._scan_reports())
+                return
+            with open(self.index_path, 'ab') as f:
+                f.write(line)
+    
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load live index entries keyed by report ID, rebuilding a missing index"""
+        with self._index_lock:
+            try:
+                st = os.stat(self.index_path)
+            except FileNotFoundError:
+                entries = self._scan_reports()
+                self._write_index(entries)
+                return entries
+            
+            # Reuse the last replay while the index file is unchanged
+            key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            if self._index_cache is not None and self._index_cache[0] == key:
+                return self._index_cache[1]
+            
+            entries = self._read_index_file()
+            self._index_cache = (key, entries)
+            return entries
+    
+    def _read_index_file(self) -> Dict[str, Dict[str, Any]]:
+        """Replay the index file, applying tombstones"""
+        entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            data = self.index_path.read_bytes()
+        except FileNotFoundError:
+            return entries
+        
+        for line in data.splitlines():
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # Skip a torn trailing line
+                continue
+            if entry.get("deleted"):
+                entries.pop(entry["report_id"], None)
+            else:
+                entries[entry["report_id"]] = entry
+        
+        return entries
+    
+    def _write_index(self, entries: Dict[str, Dict[str, Any]]):
+        """Atomically replace the index with the given live entries"""
+        tmp_path = self.index_path.with_suffix('.jsonl.tmp')
+        with open(tmp_path, 'wb') as f:
+            for entry in entries.values():
+                f.write(orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE))
+        os.replace(tmp_path, self.index_path)
+    
+    def _scan_reports(self) -> Dict[str, Dict[str, Any]]:
+        """Rebuild index entries by reading every report file"""
+        report_entries = []
+        
+        with os.scandir(self.reports_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith("report_") and name.endswith(".json") and entry.is_file():
+                    report_entries.append(entry)
+        
+        # Overlap file reads across a small pool; the read syscalls and JSON
+        # parsing in pydantic-core release the GIL
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+            entries = [e for e in pool.map(self._load_index_entry, report_entries) if e is not None]
+        
+        entries.sort(key=_created_key)
+        return {entry["report_id"]: entry for entry in entries}
+    
+    def _load_index_entry(self, entry: os.DirEntry) -> Optional[Dict[str, Any]]:
+        """Read one report file into an index entry"""
+        try:
+            with open(entry.path, 'rb') as f:
+                summary = _REPORT_SUMMARY_ADAPTER.validate_json(f.read())
+            return self._index_entry(
+                entry.name[len("report_"):-len(".json")],
+                entry.stat(),
+                summary.metadata.model_dump(),
+                summary.diagnosis_result.model_dump()
+            )
+        except Exception as e:
+            print(f"Error processing report file {entry.name}: {e}")
+            return None
+    
     def _generate_summary_preview(self, summary: str) -> str:
         """Generate a short preview from the summary"""
         if not summary:
             return "No summary available"
         
-        # Get first 2 sentences
-        import re
-        sentences = re.split(r'[.!?]+', summary.strip())
+        # Get first 2 sentences (the remainder is left unsplit)
+        sentences = _SENTENCE_SPLIT_RE.split(summary.strip(), maxsplit=2)
         preview_sentences = []
         
         for sentence in sentences[:2]:
@@ -261,27 +436,23 @@ class JsonReportWriter:
         return preview if preview else "No preview available"
     
     def _cleanup_old_reports(self):
-        """Clean up old reports if exceeding max limit"""
+        """Clean up old reports if exceeding max limit and compact the index"""
         max_reports = self.config.reports.max_reports
         
-        if max_reports <= 0:
-            return
-        
-        # Get all report files sorted by modification time
-        report_files = []
-        for file_path in self.reports_dir.glob("report_*.json"):
-            if file_path.is_file():
-                report_files.append((file_path.stat().st_mtime, file_path))
-        
-        # Sort by modification time (newest first)
-        report_files.sort(reverse=True)
-        
-        # Remove excess files
-        if len(report_files) > max_reports:
-            files_to_remove = report_files[max_reports:]
-            for _, file_path in files_to_remove:
-                try:
-                    file_path.unlink()
-                    print(f"Removed old report: {file_path.name}")
-                except Exception as e:
-                    print(f"Failed to remove old report {file_path.name}: {e}")
+        with self._index_lock:
+            entries = self._read_index_file()
+            
+            if max_reports > 0 and len(entries) > max_reports:
+                # Remove the oldest excess files without sorting the kept set
+                excess = heapq.nsmallest(len(entries) - max_reports, entries.values(), key=_created_key)
+                for entry in excess:
+                    file_path = self.reports_dir / f"report_{entry['report_id']}.json"
+                    try:
+                        file_path.unlink(missing_ok=True)
+                        del entries[entry["report_id"]]
+                        print(f"Removed old report: {file_path.name}")
+                    except Exception as e:
+                        print(f"Failed to remove old report {file_path.name}: {e}")
+            
+            # Rewrite without tombstones and removed reports
+            self._write_index(entries)
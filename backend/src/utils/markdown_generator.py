@@ -1,24 +1,100 @@
 """
 Markdown generator for converting JSON reports to markdown format
 """
+import functools
 import re
-from datetime import datetime
-from typing import Dict, Any, List, Iterator
-from pathlib import Path
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+
+# Recommendation parsing patterns, compiled once
+_RE_SECTION_SPLIT_A = re.compile(r'(?=\d*\.\s*\*?\*?[A-Z][^:]*:)')
+_RE_SECTION_SPLIT_B = re.compile(r'(?=\d+\.\s*[A-Z])')
+_RE_IS_TITLE = re.compile(r'^(?:\d*\.\s*\*?\*?[A-Z].*[:\*]|\. \*\*)')
+# Title clean-up in one pass: capture the text between the "1. " / "**"
+# prefix and the trailing "**:" markers. Section titles drop bold markers
+# even without numbering; grouped titles only drop them after a number.
+_RE_SECTION_TITLE = re.compile(r'(?:\d*\.\s*)?\*?\*?(.*?)\*?\*?:?\s*\Z', re.DOTALL)
+_RE_GROUP_TITLE = re.compile(r'(?:\d*\.\s*\*?\*?)?(.*?)\*?\*?:?\s*\Z', re.DOTALL)
+
+# Code line classification: one C-level match per line instead of a chain of
+# startswith/endswith/in checks. Lookaheads keep the "contains" tests.
+_RE_IS_C_CODE = re.compile(
+    r'(?://|if \(|for \(|printf\(|```'          # C-like prefixes
+    r'|.*[{;]\Z'                                # block opener or statement end
+    r'|\s*[a-zA-Z_][a-zA-Z0-9_]*\s*\()',         # function call
+    re.DOTALL
+)
+_RE_IS_SHELL_CODE = re.compile(
+    r'(?:#(?! Example)'                         # comments, except "# Example"
+    r'|(?=for )(?=.*in )(?=.* do\Z)'            # for ... in ... do
+    r'|echo |cat |ls |cd |if \[|exit |fi|done'  # command prefixes
+    r'|\s*(?:fi|done)\s*\Z'                     # bare fi / done
+    r'|(?=.*\$)(?=.*(?:echo|exit)))',           # $VAR with echo/exit
+    re.DOTALL
+)
+
+# Every possible confidence bar, indexed by the number of filled blocks
+_CONFIDENCE_BARS = tuple(f"[{'█' * filled}{'░' * (10 - filled)}]" for filled in range(11))
+
+# Static report blocks
+_EMPTY_REPORT = "# Error\n\nReport data not available."
+_ACTION_ITEMS = (
+    "## Action Items\n"
+    "\n"
+    "- [ ] Review the root cause analysis\n"
+    "- [ ] Implement immediate fixes\n"
+    "- [ ] Review relevant code files\n"
+    "- [ ] Update monitoring/alerts if needed\n"
+    "- [ ] Document lessons learned\n"
+    "\n"
+)
+_METADATA_HEADER = "---\n\n## Report Metadata\n\n"
+
+def _format_file_list(file_paths: Iterable[str]) -> str:
+    """Render file paths as a markdown bullet list, one line each"""
+    return "".join(f"- `{file_path}`\n" for file_path in file_paths)
+
+def _relevant_file_lines(file_item: Dict[str, Any]) -> str:
+    """Render one relevant code file entry (and its snippet count)"""
+    file_path = file_item.get('file_path', 'Unknown')
+    size_kb = file_item.get('size_kb')
+    selection_reason = file_item.get('selection_reason')
+    snippets = file_item.get('snippets', [])
+    
+    # Display file with size and reason if available
+    if size_kb and selection_reason:
+        line = f"- `{file_path}` ({size_kb:.1f}KB) - {selection_reason}\n"
+    elif size_kb:
+        line = f"- `{file_path}` ({size_kb:.1f}KB)\n"
+    elif selection_reason:
+        line = f"- `{file_path}` - {selection_reason}\n"
+    else:
+        line = f"- `{file_path}`\n"
+    
+    # Include snippets if available
+    if snippets:
+        line += f"  - {len(snippets)} relevant code snippet(s) identified\n"
+    
+    return line
 
 class MarkdownGenerator:
     """Converts JSON reports to markdown format on-demand"""
     
-    def __init__(self):
-        pass
-    
     def generate_from_json(self, json_report: Dict[str, Any]) -> str:
         """Convert a JSON report to markdown format"""
+        return "".join(self._iter_sections(json_report))
+    
+    def stream_markdown(self, json_report: Dict[str, Any]) -> Iterator[str]:
+        """Stream markdown generation for large reports, one section at a time"""
+        yield from self._iter_sections(json_report)
+    
+    def _iter_sections(self, json_report: Dict[str, Any]) -> Iterator[str]:
+        """Yield the report markdown section by section; each chunk carries its
+        own trailing newline"""
         
         if not json_report:
-            return "# Error\n\nReport data not available."
-        
-        sections = []
+            yield _EMPTY_REPORT
+            return
         
         # Extract data from JSON structure
         metadata = json_report.get('metadata', {})
@@ -26,209 +102,182 @@ class MarkdownGenerator:
         git_info = json_report.get('git_info', {})
         parsed_log = json_report.get('parsed_log', {})
         
-        # Title
-        sections.append(f"# Log Diagnosis Report")
-        sections.append("")
-        sections.append(f"**Generated:** {metadata.get('generated_at', 'Unknown')}")
-        sections.append(f"**Diagnosis ID:** `{metadata.get('diagnosis_id', 'Unknown')}`")
-        sections.append(f"**Processing Time:** {metadata.get('processing_time_seconds', 0):.2f} seconds")
-        sections.append("")
+        # Bind lookups once; fields used more than once become locals
+        md_get = metadata.get
+        dr_get = diagnosis_result.get
+        gi_get = git_info.get
+        pl_get = parsed_log.get
+        diagnosis_id = md_get('diagnosis_id', 'Unknown')
+        generated_at = md_get('generated_at', 'Unknown')
         
-        # Executive Summary
-        sections.append("## Executive Summary")
-        sections.append("")
-        sections.append(diagnosis_result.get('summary', 'No summary available'))
-        sections.append("")
+        # Title and metadata
+        yield (
+            f"# Log Diagnosis Report\n"
+            f"\n"
+            f"**Generated:** {generated_at}\n"
+            f"**Diagnosis ID:** `{diagnosis_id}`\n"
+            f"**Processing Time:** {md_get('processing_time_seconds', 0):.2f} seconds\n"
+            f"\n"
+        )
         
-        # Confidence Score
-        confidence = diagnosis_result.get('confidence_score', 0.0)
+        # Executive Summary
+        confidence = dr_get('confidence_score', 0.0)
         confidence_bar = self._create_confidence_bar(confidence)
-        sections.append(f"**Confidence Score:** {confidence:.1%} {confidence_bar}")
-        sections.append("")
+        yield (
+            f"## Executive Summary\n"
+            f"\n"
+            f"{dr_get('summary', 'No summary available')}\n"
+            f"\n"
+            f"**Confidence Score:** {confidence:.1%} {confidence_bar}\n"
+            f"\n"
+        )
         
         # Error Details
-        sections.append("## Error Details")
-        sections.append("")
-        sections.append("### Log Information")
-        sections.append("")
-        sections.append(f"- **Timestamp:** {parsed_log.get('timestamp', 'Unknown')}")
-        sections.append(f"- **Log Level:** `{parsed_log.get('level', 'Unknown')}`")
-        sections.append(f"- **Source:** {parsed_log.get('source') or 'Unknown'}")
-        sections.append(f"- **Service:** {parsed_log.get('service_name') or 'Unknown'}")
-        sections.append("")
-        
-        # Original Log Message
-        sections.append("### Original Log Message")
-        sections.append("")
-        sections.append("```")
-        sections.append(parsed_log.get('message', 'No message available'))
-        sections.append("```")
-        sections.append("")
+        yield (
+            f"## Error Details\n"
+            f"\n"
+            f"### Log Information\n"
+            f"\n"
+            f"- **Timestamp:** {pl_get('timestamp', 'Unknown')}\n"
+            f"- **Log Level:** `{pl_get('level', 'Unknown')}`\n"
+            f"- **Source:** {pl_get('source') or 'Unknown'}\n"
+            f"- **Service:** {pl_get('service_name') or 'Unknown'}\n"
+            f"\n"
+            f"### Original Log Message\n"
+            f"\n"
+            f"```\n"
+            f"{pl_get('message', 'No message available')}\n"
+            f"```\n"
+            f"\n"
+        )
         
         # Stack Trace (if available)
-        if parsed_log.get('stack_trace'):
-            sections.append("### Stack Trace")
-            sections.append("")
-            sections.append("```")
-            sections.append(parsed_log['stack_trace'])
-            sections.append("```")
-            sections.append("")
+        stack_trace = pl_get('stack_trace')
+        if stack_trace:
+            yield f"### Stack Trace\n\n```\n{stack_trace}\n```\n\n"
         
         # Extracted Error Patterns
-        if parsed_log.get('extracted_errors'):
-            sections.append("### Extracted Error Patterns")
-            sections.append("")
-            for i, error in enumerate(parsed_log['extracted_errors'], 1):
-                sections.append(f"{i}. `{error}`")
-            sections.append("")
+        extracted_errors = pl_get('extracted_errors')
+        if extracted_errors:
+            error_lines = "".join(f"{i}. `{error}`\n" for i, error in enumerate(extracted_errors, 1))
+            yield f"### Extracted Error Patterns\n\n{error_lines}\n"
         
         # Root Cause Analysis
-        if diagnosis_result.get('root_cause'):
-            sections.append("## Root Cause Analysis")
-            sections.append("")
-            sections.append(diagnosis_result['root_cause'])
-            sections.append("")
+        root_cause = dr_get('root_cause')
+        if root_cause:
+            yield f"## Root Cause Analysis\n\n{root_cause}\n\n"
         
         # Technical Analysis
-        if diagnosis_result.get('error_analysis'):
-            sections.append("## Technical Analysis")
-            sections.append("")
-            sections.append(diagnosis_result['error_analysis'])
-            sections.append("")
+        error_analysis = dr_get('error_analysis')
+        if error_analysis:
+            yield f"## Technical Analysis\n\n{error_analysis}\n\n"
         
         # Repository Context
-        sections.append("## Repository Context")
-        sections.append("")
-        sections.append(f"- **Branch:** `{git_info.get('branch', 'Unknown')}`")
-        sections.append(f"- **Current Commit:** `{git_info.get('current_commit', 'Unknown')[:12]}`")
-        sections.append(f"- **Last Pull:** {git_info.get('last_pull_time', 'Unknown')}")
-        sections.append("")
+        yield (
+            f"## Repository Context\n"
+            f"\n"
+            f"- **Branch:** `{gi_get('branch', 'Unknown')}`\n"
+            f"- **Current Commit:** `{gi_get('current_commit', 'Unknown')[:12]}`\n"
+            f"- **Last Pull:** {gi_get('last_pull_time', 'Unknown')}\n"
+            f"\n"
+        )
         
         # Recent Commits
-        recent_commits = git_info.get('recent_commits', [])
+        recent_commits = gi_get('recent_commits', [])
         if recent_commits:
-            sections.append("### Recent Commits")
-            sections.append("")
-            for commit in recent_commits[:5]:  # Show top 5
-                sections.append(f"#### {commit.get('short_hash', commit.get('hash', 'Unknown')[:12])} - {commit.get('message', 'No message')}")
-                sections.append(f"**Author:** {commit.get('author', 'Unknown')} | **Date:** {commit.get('date', 'Unknown')}")
-                
-                if commit.get('changed_files'):
-                    sections.append("**Changed Files:**")
-                    for file_path in commit['changed_files'][:10]:  # Limit to 10 files
-                        sections.append(f"- `{file_path}`")
-                sections.append("")
+            yield "### Recent Commits\n\n"
+            for commit in islice(recent_commits, 5):  # Show top 5
+                commit_files = commit.get('changed_files')
+                files_block = (
+                    "**Changed Files:**\n" + _format_file_list(islice(commit_files, 10))  # Limit to 10 files
+                    if commit_files else ""
+                )
+                yield (
+                    f"#### {commit.get('short_hash', commit.get('hash', 'Unknown')[:12])} - {commit.get('message', 'No message')}\n"
+                    f"**Author:** {commit.get('author', 'Unknown')} | **Date:** {commit.get('date', 'Unknown')}\n"
+                    f"{files_block}\n"
+                )
         
         # Recently Changed Files
-        changed_files = git_info.get('changed_files', [])
+        changed_files = gi_get('changed_files', [])
         if changed_files:
-            sections.append("### Recently Changed Files")
-            sections.append("")
-            for file_path in changed_files[:20]:  # Show up to 20 files
-                sections.append(f"- `{file_path}`")
-            sections.append("")
+            # Show up to 20 files
+            yield f"### Recently Changed Files\n\n{_format_file_list(islice(changed_files, 20))}\n"
         
         # Relevant Code Files
-        relevant_files = diagnosis_result.get('relevant_code_files', [])
+        relevant_files = dr_get('relevant_code_files', [])
         if relevant_files:
-            sections.append("## Relevant Code Files")
-            sections.append("")
-            sections.append("The following files are most likely related to this error:")
-            sections.append("")
-            
-            for file_item in relevant_files:
-                file_path = file_item.get('file_path', 'Unknown')
-                size_kb = file_item.get('size_kb')
-                selection_reason = file_item.get('selection_reason')
-                snippets = file_item.get('snippets', [])
-                
-                # Display file with size and reason if available
-                if size_kb and selection_reason:
-                    sections.append(f"- `{file_path}` ({size_kb:.1f}KB) - {selection_reason}")
-                elif size_kb:
-                    sections.append(f"- `{file_path}` ({size_kb:.1f}KB)")
-                elif selection_reason:
-                    sections.append(f"- `{file_path}` - {selection_reason}")
-                else:
-                    sections.append(f"- `{file_path}`")
-                
-                # Include snippets if available
-                if snippets and len(snippets) > 0:
-                    sections.append(f"  - {len(snippets)} relevant code snippet(s) identified")
-            
-            sections.append("")
+            file_lines = "".join(_relevant_file_lines(file_item) for file_item in relevant_files)
+            yield (
+                f"## Relevant Code Files\n"
+                f"\n"
+                f"The following files are most likely related to this error:\n"
+                f"\n"
+                f"{file_lines}\n"
+            )
         
         # Recommendations
-        recommendations = diagnosis_result.get('recommendations', [])
+        recommendations = dr_get('recommendations', [])
         if recommendations:
-            sections.append("## Recommendations")
-            sections.append("")
+            yield "## Recommendations\n\n"
             
             # Format recommendations properly
-            formatted_recommendations = self._format_recommendations(recommendations)
+            formatted_recommendations = self._format_recommendations(tuple(recommendations))
             
-            for i, recommendation in enumerate(formatted_recommendations, 1):
-                sections.append(f"### {i}. {recommendation['title']}")
-                sections.append("")
-                if recommendation['content']:
-                    sections.extend(recommendation['content'])
-                    sections.append("")
+            for i, (title, content) in enumerate(formatted_recommendations, 1):
+                if content is not None:
+                    yield f"### {i}. {title}\n\n{content}\n\n"
+                else:
+                    yield f"### {i}. {title}\n\n"
         
         # Action Items
-        sections.append("## Action Items")
-        sections.append("")
-        sections.append("- [ ] Review the root cause analysis")
-        sections.append("- [ ] Implement immediate fixes")
-        sections.append("- [ ] Review relevant code files")
-        sections.append("- [ ] Update monitoring/alerts if needed")
-        sections.append("- [ ] Document lessons learned")
-        sections.append("")
+        yield _ACTION_ITEMS
         
         # Metadata
-        sections.append("---")
-        sections.append("")
-        sections.append("## Report Metadata")
-        sections.append("")
-        sections.append(f"- **Report ID:** `{json_report.get('report_id', 'Unknown')}`")
-        sections.append(f"- **Diagnosis ID:** `{metadata.get('diagnosis_id', 'Unknown')}`")
-        sections.append(f"- **Version:** {json_report.get('version', '2.0')}")
-        sections.append(f"- **Generated At:** {metadata.get('generated_at', 'Unknown')}")
-        
-        return "\n".join(sections)
-    
-    def stream_markdown(self, json_report: Dict[str, Any]) -> Iterator[str]:
-        """Stream markdown generation for large reports"""
-        # For now, just yield the complete markdown
-        # This can be optimized later for very large reports
-        yield self.generate_from_json(json_report)
+        yield (
+            f"{_METADATA_HEADER}"
+            f"- **Report ID:** `{json_report.get('report_id', 'Unknown')}`\n"
+            f"- **Diagnosis ID:** `{diagnosis_id}`\n"
+            f"- **Version:** {json_report.get('version', '2.0')}\n"
+            f"- **Generated At:** {generated_at}"
+        )
     
     def _create_confidence_bar(self, confidence: float) -> str:
         """Create a visual confidence bar"""
         filled_blocks = int(confidence * 10)
-        empty_blocks = 10 - filled_blocks
         
-        filled = "█" * filled_blocks
-        empty = "░" * empty_blocks
-        
-        return f"[{filled}{empty}]"
+        # Clamp so out-of-range scores still render a 10-block bar
+        return _CONFIDENCE_BARS[min(max(filled_blocks, 0), 10)]
     
-    def _format_recommendations(self, recommendations: List[str]) -> List[Dict[str, Any]]:
-        """Format and group recommendations properly"""
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _format_recommendations(
+        recommendations: Tuple[str, ...],
+        add_default_if_empty: bool = False
+    ) -> Tuple[Tuple[str, Optional[str]], ...]:
+        """Format and group recommendations into (title, content) pairs; content
+        is pre-joined, or None if empty. Memoized since it is a pure function of
+        the recommendations. A generic recommendation is only substituted for
+        an empty result when add_default_if_empty is set."""
         if not recommendations:
-            return []
+            return ()
         
         formatted_recommendations = []
         
         # Join all recommendations into a single text block for processing
         full_text = "\n".join(recommendations)
         
-        # Split by common recommendation indicators
-        sections = re.split(r'(?=\d*\.\s*\*?\*?[A-Z][^:]*:)', full_text)
-        
-        # If no clear sections found, treat each major chunk as a recommendation
-        if len(sections) <= 1:
-            # Try splitting on numbered recommendations differently
-            sections = re.split(r'(?=\d+\.\s*[A-Z])', full_text)
+        # Both split patterns need a literal "." (as in "1." or ". **"), so
+        # plain prose without one skips straight to the grouping fallback
+        sections = [full_text]
+        if '.' in full_text:
+            # Split by common recommendation indicators
+            sections = _RE_SECTION_SPLIT_A.split(full_text)
+            
+            # If no clear sections found, treat each major chunk as a recommendation
+            if len(sections) <= 1:
+                # Try splitting on numbered recommendations differently
+                sections = _RE_SECTION_SPLIT_B.split(full_text)
         
         # If still no sections, fallback to simple grouping
         if len(sections) <= 1:
@@ -242,20 +291,17 @@ class MarkdownGenerator:
                     continue
                 
                 # Check if this looks like a title (starts with number/bullet and has colon or **bold**)
-                if (re.match(r'^\d*\.\s*\*?\*?[A-Z].*[:\*]', item) or 
-                    item.startswith('. **') or 
-                    (len(item) < 50 and ':' in item)):
-                    
+                is_title = _RE_IS_TITLE.match(item) is not None or (len(item) < 50 and ':' in item)
+                if is_title:
                     # Save previous group if it exists
                     if current_title and current_group:
-                        formatted_recommendations.append({
-                            "title": current_title,
-                            "content": current_group
-                        })
+                        formatted_recommendations.append((
+                            current_title,
+                            "\n".join(current_group)
+                        ))
                     
                     # Start new group
-                    current_title = re.sub(r'^\d*\.\s*\*?\*?', '', item)
-                    current_title = re.sub(r'\*?\*?:?\s*$', '', current_title).strip()
+                    current_title = _RE_GROUP_TITLE.match(item).group(1).strip()
                     current_group = []
                 
                 else:
@@ -264,17 +310,17 @@ class MarkdownGenerator:
             
             # Add final group
             if current_title and current_group:
-                formatted_recommendations.append({
-                    "title": current_title,
-                    "content": current_group
-                })
+                formatted_recommendations.append((
+                    current_title,
+                    "\n".join(current_group)
+                ))
             
             # If we still have no recommendations, add the remaining items as a single recommendation
             if not formatted_recommendations and recommendations:
-                formatted_recommendations.append({
-                    "title": "Implementation Steps",
-                    "content": recommendations
-                })
+                formatted_recommendations.append((
+                    "Implementation Steps",
+                    "\n".join(recommendations)
+                ))
         
         else:
             # Process the sections we found
@@ -291,10 +337,8 @@ class MarkdownGenerator:
                 first_line = lines[0]
                 
                 # Clean up numbering and formatting from title
-                title = re.sub(r'^\d*\.\s*', '', first_line)  # Remove "1. "
-                title = re.sub(r'^\*?\*?', '', title)  # Remove bold markers
-                title = re.sub(r'\*?\*?:?\s*$', '', title)  # Remove trailing markers
-                title = title.strip()
+                # Remove "1. ", bold markers and trailing markers
+                title = _RE_SECTION_TITLE.match(first_line).group(1).strip()
                 
                 if not title or len(title) < 3:
                     title = f"Recommendation {i + 1}"
@@ -306,22 +350,19 @@ class MarkdownGenerator:
                 
                 # Join lines that might be part of the same logical unit
                 processed_lines = []
+                tail = lines[1:]  # Skip the title line
+                n = len(tail)
                 j = 0
-                while j < len(lines[1:]):  # Skip the title line
-                    line = lines[j + 1]  # +1 because we're skipping the title
-                    if not line:
-                        j += 1
-                        continue
+                while j < n:
+                    line = tail[j]
                     
                     # Check if this line and the next should be joined (like broken printf statements)
-                    if (j + 2 < len(lines) and 
-                        line.endswith('"') == False and 
+                    if (j + 1 < n and
                         'printf(' in line and
-                        lines[j + 2].startswith('", ')):
+                        not line.endswith('"') and
+                        tail[j + 1].startswith('", ')):
                         # Join broken printf statement
-                        next_line = lines[j + 2]
-                        joined_line = line + '\\n' + next_line
-                        processed_lines.append(joined_line)
+                        processed_lines.append(line + '\\n' + tail[j + 1])
                         j += 2  # Skip the next line since we've joined it
                     else:
                         processed_lines.append(line)
@@ -333,19 +374,8 @@ class MarkdownGenerator:
                         continue
                     
                     # Detect code patterns - be more specific about shell vs C
-                    is_c_code = (
-                        line.startswith(('//','if (','for (','printf(','```')) or
-                        line.endswith(('{',';')) or
-                        re.match(r'^\s*[a-zA-Z_][a-zA-Z0-9_]*\s*\(', line)  # function calls
-                    )
-                    
-                    is_shell_code = (
-                        line.startswith('#') and not line.startswith('# Example') or
-                        line.startswith('for ') and 'in ' in line and line.endswith(' do') or
-                        line.startswith(('echo ', 'cat ', 'ls ', 'cd ', 'if [', 'exit ', 'fi', 'done')) or
-                        line.strip() in ['fi', 'done'] or
-                        ('$' in line and any(cmd in line for cmd in ['echo', 'exit']))
-                    )
+                    is_c_code = _RE_IS_C_CODE.match(line) is not None
+                    is_shell_code = _RE_IS_SHELL_CODE.match(line) is not None
                     
                     is_code_line = is_c_code or is_shell_code
                     
@@ -377,23 +407,23 @@ class MarkdownGenerator:
                     content_lines.extend(code_block)
                     content_lines.append("```")
                 
-                formatted_recommendations.append({
-                    "title": title,
-                    "content": content_lines
-                })
+                formatted_recommendations.append((
+                    title,
+                    "\n".join(content_lines) if content_lines else None
+                ))
         
-        # Ensure we have at least one recommendation
-        if not formatted_recommendations:
-            formatted_recommendations = [{
-                "title": "Review Error Analysis",
-                "content": [
-                    "Based on the diagnosis above:",
-                    "",
-                    "- Review the root cause analysis",
-                    "- Check the identified code files", 
-                    "- Implement suggested fixes",
+        # Optionally ensure we have at least one recommendation
+        if not formatted_recommendations and add_default_if_empty:
+            formatted_recommendations = [(
+                "Review Error Analysis",
+                (
+                    "Based on the diagnosis above:\n"
+                    "\n"
+                    "- Review the root cause analysis\n"
+                    "- Check the identified code files\n"
+                    "- Implement suggested fixes\n"
                     "- Monitor for similar issues"
-                ]
-            }]
+                )
+            )]
         
-        return formatted_recommendations
+        return tuple(formatted_recommendations)
@@ -1,14 +1,156 @@
 """
 Markdown report generator for log diagnosis results
 """
+import asyncio
+import functools
 import hashlib
-import json
-from datetime import datetime
+import heapq
+import mmap
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional
-from src.models.schemas import LogDiagnosisResponse, DiagnosisResult, GitInfo, ParsedLogEntry
+from typing import Dict, Any, List, Optional, Tuple
+import orjson
+from src.models.schemas import LogDiagnosisResponse, ParsedLogEntry
 from src.core.config import config_manager
 
+# Every possible confidence bar, indexed by the number of filled blocks
+_CONFIDENCE_BARS = tuple(f"[{'█' * filled}{'░' * (10 - filled)}]" for filled in range(11))
+
+# Static report blocks; each ends where the next section's join newline goes
+_ACTION_ITEMS = (
+    "## Action Items\n"
+    "\n"
+    "- [ ] Review the root cause analysis\n"
+    "- [ ] Implement immediate fixes\n"
+    "- [ ] Review relevant code files\n"
+    "- [ ] Update monitoring/alerts if needed\n"
+    "- [ ] Document lessons learned\n"
+)
+_METADATA_HEADER = "---\n\n## Report Metadata\n"
+
+# Sidecar JSON is written compact; non-string dict keys are stringified like json.dumps
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Number of (filename, mtime) display-info entries kept for report listings
+DISPLAY_CACHE_SIZE = 1024
+
+# Report stats are reused while the reports directory's mtime is unchanged,
+# once that mtime is at least this old (coarse filesystem timestamps could
+# otherwise hide a change made in the same tick)
+STATS_CACHE_SETTLE_SECONDS = 2
+STATS_READ_WORKERS = 8
+
+# Sidecars at least this large (usually from big code snippets) are parsed
+# from a memory map instead of being copied into a bytes object first
+SIDECAR_MMAP_THRESHOLD = 1024 * 1024
+
+# Append-only listing index persisted next to the reports; rewritten from the
+# in-memory cache once it holds twice as many lines as the cache
+INDEX_FILENAME = "markdown_index.jsonl"
+
+# Recommendation parsing patterns, compiled once
+_RE_SECTION_SPLIT_A = re.compile(r'(?=\d*\.\s*\*?\*?[A-Z][^:]*:)')
+_RE_SECTION_SPLIT_B = re.compile(r'(?=\d+\.\s*[A-Z])')
+_RE_IS_TITLE = re.compile(r'^\d*\.\s*\*?\*?[A-Z].*[:\*]')
+_RE_TITLE_PREFIX = re.compile(r'^\d*\.\s*\*?\*?')
+_RE_TITLE_NUMBER = re.compile(r'^\d*\.\s*')
+_RE_TITLE_BOLD = re.compile(r'^\*?\*?')
+_RE_TITLE_TRAILER = re.compile(r'\*?\*?:?\s*$')
+
+# Code line classification: one C-level match per line instead of a chain of
+# startswith/endswith/in checks. Lookaheads keep the "contains" tests.
+_RE_IS_C_CODE = re.compile(
+    r'(?://|if \(|for \(|printf\(|```'          # C-like prefixes
+    r'|.*[{;]\Z'                                # block opener or statement end
+    r'|\s*[a-zA-Z_][a-zA-Z0-9_]*\s*\()',         # function call
+    re.DOTALL
+)
+_RE_IS_SHELL_CODE = re.compile(
+    r'(?:#(?! Example)'                         # comments, except "# Example"
+    r'|(?=for )(?=.*in )(?=.* do\Z)'            # for ... in ... do
+    r'|echo |cat |ls |cd |if \[|exit |fi|done'  # command prefixes
+    r'|\s*(?:fi|done)\s*\Z'                     # bare fi / done
+    r'|(?=.*\$)(?=.*(?:echo|exit)))',           # $VAR with echo/exit
+    re.DOTALL
+)
+
+# First "confidence_score" key in a sidecar. _save_structured_data emits
+# diagnosis_result before anything holding arbitrary keys, so it is the
+# report's own score; the value is checked by float() below.
+_RE_CONFIDENCE_SCORE = re.compile(rb'"confidence_score"\s*:\s*([^,}\s]+)')
+
+# Summary title/preview patterns
+_RE_SENTENCE_SPLIT = re.compile(r'[.!?]+')
+_TITLE_ERROR_PATTERNS = (
+    (re.compile(r'failed to (open|read|load|compile|initialize) (.+?)(?:\s|,|\.|$)'), lambda m: f"Failed to {m.group(1).title()} {m.group(2).title()}"),
+    (re.compile(r'cannot (open|read|load|find|access) (.+?)(?:\s|,|\.|$)'), lambda m: f"Cannot {m.group(1).title()} {m.group(2).title()}"),
+    (re.compile(r'missing (.+?)(?:\s|,|\.|$)'), lambda m: f"Missing {m.group(1).title()}"),
+    (re.compile(r'invalid (.+?)(?:\s|,|\.|$)'), lambda m: f"Invalid {m.group(1).title()}"),
+    (re.compile(r'corrupt(ed)? (.+?)(?:\s|,|\.|$)'), lambda m: f"Corrupted {m.group(2).title()}"),
+)
+_TITLE_REWRITES = (
+    (re.compile(r'^(the\s+)?error\s+(occurs|arises|is)', re.IGNORECASE), 'Error'),
+    (re.compile(r'^(the\s+)?log\s+(indicates|shows)', re.IGNORECASE), 'Log Analysis:'),
+    (re.compile(r'^(the\s+)?issue\s+(is|occurs)', re.IGNORECASE), 'Issue:'),
+    # Remove unnecessary words
+    (re.compile(r'\s+(during|within|in\s+the)\s+', re.IGNORECASE), ' '),
+    (re.compile(r'\s+specifically\s+', re.IGNORECASE), ' '),
+)
+
+def _replace_file(path: Path, data: bytes):
+    """Write a payload to a temporary file and atomically move it into place"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    # Unbuffered: the payload is already encoded, usually in one write(2)
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+@functools.lru_cache(maxsize=2048)
+def _sidecar_path(reports_dir: Path, filename: str) -> Path:
+    """Path of the JSON sidecar that sits next to a markdown report"""
+    return reports_dir / filename.replace('.md', '.json')
+
+def _relevant_file_entry(file_item: Any) -> str:
+    """Render one relevant code file as a markdown list entry"""
+    # Handle both string and dict formats
+    if isinstance(file_item, dict):
+        file_path = file_item.get('file_path', str(file_item))
+        size_kb = file_item.get('size_kb')
+        selection_reason = file_item.get('selection_reason')
+        snippets = file_item.get('snippets', [])
+        
+        # Display file with size and reason if available
+        if size_kb and selection_reason:
+            entry = f"- `{file_path}` ({size_kb:.1f}KB) - {selection_reason}"
+        elif size_kb:
+            entry = f"- `{file_path}` ({size_kb:.1f}KB)"
+        elif selection_reason:
+            entry = f"- `{file_path}` - {selection_reason}"
+        else:
+            entry = f"- `{file_path}`"
+        
+        # Include snippets if available
+        if snippets:
+            entry += f"\n  - {len(snippets)} relevant code snippet(s) identified"
+        return entry
+    
+    if isinstance(file_item, str):
+        return f"- `{file_item}`"
+    
+    # Handle FileContentInfo objects directly
+    return f"- `{file_item.file_path}`"
+
 class MarkdownReportWriter:
     """Generates markdown reports for log diagnosis results"""
     
@@ -16,6 +158,43 @@ class MarkdownReportWriter:
         self.config = config_manager.config
         self.reports_dir = Path(self.config.reports.output_dir)
         self.reports_dir.mkdir(parents=True, exist_ok=True)
+        # Settings read on every report write, resolved once
+        self._filename_format = self.config.reports.filename_format
+        self._max_reports = self.config.reports.max_reports
+        
+        # Min-heap of (mtime_ns, filename) for the markdown reports on disk, so
+        # cleanup can evict the oldest without rescanning the directory.
+        # _report_mtimes holds the live entry per file; heap entries that no
+        # longer match it (overwritten reports) are skipped when popped.
+        self._reports_lock = threading.Lock()
+        self._report_heap: List[Tuple[int, str]] = []
+        self._report_mtimes: Dict[str, int] = {}
+        if self._max_reports > 0:
+            self._scan_report_mtimes()
+        
+        # Listing data derived from each report's sidecar, keyed by
+        # (filename, mtime_ns) so a rewritten report is picked up again.
+        # Seeded from the listing index so a fresh process doesn't have to
+        # parse every sidecar.
+        self.index_path = self.reports_dir / INDEX_FILENAME
+        self._index_lock = threading.Lock()
+        self._index_lines = 0
+        self._display_cache: OrderedDict = OrderedDict()
+        self._load_index()
+        
+        # Sidecar writes happen off the request path; one worker keeps
+        # writes to the same file in submission order. Payloads stay in
+        # _pending_sidecars until written so reads see their own writes.
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-sidecar")
+        self._pending_lock = threading.Lock()
+        self._pending_sidecars: Dict[Path, bytes] = {}
+        
+        # Sidecar reads for reports missing from the listing cache during a
+        # stats pass are IO-bound, so they are spread over a few threads
+        self._read_pool = ThreadPoolExecutor(max_workers=STATS_READ_WORKERS, thread_name_prefix="report-stats")
+        
+        # ((reports dir mtime_ns, date), stats) from the last get_report_stats
+        self._stats_cache: Optional[Tuple[Tuple[int, Any], Dict[str, Any]]] = None
     
     def generate_report(
         self, 
@@ -31,29 +210,50 @@ class MarkdownReportWriter:
         # Generate markdown content
         markdown_content = self._build_markdown_content(diagnosis_response, parsed_log)
         
-        # Write markdown to file
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+        # Write markdown to file as one pre-encoded payload
+        report_path.write_bytes(markdown_content.encode('utf-8'))
         
         # Save structured data alongside markdown
-        self._save_structured_data(filename, diagnosis_response, parsed_log)
+        structured_data = self._save_structured_data(filename, diagnosis_response, parsed_log)
+        
+        # Index the listing info now, from the data already in memory
+        mtime_ns = report_path.stat().st_mtime_ns
+        if structured_data is not None:
+            self._remember_listing_info(
+                (filename, mtime_ns),
+                self._generate_display_info(filename, structured_data),
+                structured_data["diagnosis_id"]
+            )
         
         # Clean up old reports if needed
-        self._cleanup_old_reports()
+        self._cleanup_old_reports(filename, mtime_ns)
         
         return str(report_path)
     
+    async def generate_report_async(
+        self,
+        diagnosis_response: LogDiagnosisResponse,
+        parsed_log: ParsedLogEntry
+    ) -> str:
+        """Generate a report from async code without blocking the event loop on file IO"""
+        return await asyncio.to_thread(self.generate_report, diagnosis_response, parsed_log)
+    
     def _generate_filename(self, diagnosis_response: LogDiagnosisResponse, parsed_log: ParsedLogEntry) -> str:
         """Generate filename for the report"""
-        timestamp = diagnosis_response.timestamp.strftime("%Y%m%d_%H%M%S")
+        timestamp = f"{diagnosis_response.timestamp:%Y%m%d_%H%M%S}"
         
-        # Create hash from log content for uniqueness
+        # Create hash from log content for uniqueness (not a security hash;
+        # a 4-byte BLAKE2b digest gives the same 8 hex characters as before)
+        # str() returns text content as-is and only renders JSON content; lone
+        # surrogates from escaped JSON input are hashed instead of raising
         log_content = str(parsed_log.raw_content)
-        content_hash = hashlib.md5(log_content.encode()).hexdigest()[:8]
+        content_hash = hashlib.blake2b(
+            log_content.encode('utf-8', 'surrogatepass'),
+            digest_size=4
+        ).hexdigest()
         
         # Use configured format or default
-        filename_format = self.config.reports.filename_format
-        filename = filename_format.format(
+        filename = self._filename_format.format(
             timestamp=timestamp,
             hash=content_hash
         )
@@ -67,211 +267,164 @@ class MarkdownReportWriter:
     ) -> str:
         """Build the complete markdown content"""
         
-        sections = []
-        
-        # Title
-        sections.append(f"# Log Diagnosis Report")
-        sections.append("")
-        sections.append(f"**Generated:** {diagnosis_response.timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-        sections.append(f"**Diagnosis ID:** `{diagnosis_response.diagnosis_id}`")
-        sections.append(f"**Processing Time:** {diagnosis_response.processing_time_seconds:.2f} seconds")
-        sections.append("")
-        
-        # Executive Summary
-        sections.append("## Executive Summary")
-        sections.append("")
-        sections.append(diagnosis_response.diagnosis_result.summary)
-        sections.append("")
-        
-        # Confidence Score
-        confidence = diagnosis_response.diagnosis_result.confidence_score
-        confidence_bar = self._create_confidence_bar(confidence)
-        sections.append(f"**Confidence Score:** {confidence:.1%} {confidence_bar}")
-        sections.append("")
-        
-        # Error Details
-        sections.append("## Error Details")
-        sections.append("")
-        sections.append("### Log Information")
-        sections.append("")
-        sections.append(f"- **Timestamp:** {parsed_log.timestamp or 'Unknown'}")
-        sections.append(f"- **Log Level:** `{parsed_log.level}`")
-        sections.append(f"- **Source:** {parsed_log.source or 'Unknown'}")
-        sections.append(f"- **Service:** {parsed_log.service_name or 'Unknown'}")
-        sections.append("")
-        
-        # Original Log Message
-        sections.append("### Original Log Message")
-        sections.append("")
-        sections.append("```")
-        sections.append(parsed_log.message)
-        sections.append("```")
-        sections.append("")
+        diagnosis_result = diagnosis_response.diagnosis_result
+        git_info = diagnosis_response.git_info
+        confidence = diagnosis_result.confidence_score
+        
+        # Each entry is a whole section; the fixed parts are single f-strings
+        # and only the variable-length lists are assembled line by line
+        sections = [
+            "# Log Diagnosis Report\n"
+            "\n"
+            f"**Generated:** {diagnosis_response.timestamp:%Y-%m-%d %H:%M:%S UTC}\n"
+            f"**Diagnosis ID:** `{diagnosis_response.diagnosis_id}`\n"
+            f"**Processing Time:** {diagnosis_response.processing_time_seconds:.2f} seconds\n"
+            "\n"
+            "## Executive Summary\n"
+            "\n"
+            f"{diagnosis_result.summary}\n"
+            "\n"
+            f"**Confidence Score:** {confidence:.1%} {self._create_confidence_bar(confidence)}\n"
+            "\n"
+            "## Error Details\n"
+            "\n"
+            "### Log Information\n"
+            "\n"
+            f"- **Timestamp:** {parsed_log.timestamp or 'Unknown'}\n"
+            f"- **Log Level:** `{parsed_log.level}`\n"
+            f"- **Source:** {parsed_log.source or 'Unknown'}\n"
+            f"- **Service:** {parsed_log.service_name or 'Unknown'}\n"
+            "\n"
+            "### Original Log Message\n"
+            "\n"
+            "```\n"
+            f"{parsed_log.message}\n"
+            "```\n"
+        ]
         
         # Stack Trace (if available)
         if parsed_log.stack_trace:
-            sections.append("### Stack Trace")
-            sections.append("")
-            sections.append("```")
-            sections.append(parsed_log.stack_trace)
-            sections.append("```")
-            sections.append("")
+            sections.append(f"### Stack Trace\n\n```\n{parsed_log.stack_trace}\n```\n")
         
         # Extracted Error Patterns
         if parsed_log.extracted_errors:
-            sections.append("### Extracted Error Patterns")
-            sections.append("")
-            for i, error in enumerate(parsed_log.extracted_errors, 1):
-                sections.append(f"{i}. `{error}`")
-            sections.append("")
-        
-        # Root Cause Analysis
-        sections.append("## Root Cause Analysis")
-        sections.append("")
-        sections.append(diagnosis_response.diagnosis_result.root_cause)
-        sections.append("")
-        
-        # Technical Analysis
-        sections.append("## Technical Analysis")
-        sections.append("")
-        sections.append(diagnosis_response.diagnosis_result.error_analysis)
-        sections.append("")
-        
-        # Repository Context
-        sections.append("## Repository Context")
-        sections.append("")
-        git_info = diagnosis_response.git_info
-        sections.append(f"- **Branch:** `{git_info.branch}`")
-        sections.append(f"- **Current Commit:** `{git_info.current_commit[:12]}`")
-        sections.append(f"- **Last Pull:** {git_info.last_pull_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-        sections.append("")
+            error_list = "\n".join([f"{i}. `{error}`" for i, error in enumerate(parsed_log.extracted_errors, 1)])
+            sections.append(f"### Extracted Error Patterns\n\n{error_list}\n")
+        
+        # Root Cause Analysis, Technical Analysis and Repository Context
+        sections.append(
+            "## Root Cause Analysis\n"
+            "\n"
+            f"{diagnosis_result.root_cause}\n"
+            "\n"
+            "## Technical Analysis\n"
+            "\n"
+            f"{diagnosis_result.error_analysis}\n"
+            "\n"
+            "## Repository Context\n"
+            "\n"
+            f"- **Branch:** `{git_info.branch}`\n"
+            f"- **Current Commit:** `{git_info.current_commit[:12]}`\n"
+            f"- **Last Pull:** {git_info.last_pull_time:%Y-%m-%d %H:%M:%S UTC}\n"
+        )
         
         # Recent Commits
         if git_info.recent_commits:
-            sections.append("### Recent Commits")
-            sections.append("")
+            commit_lines = ["### Recent Commits", ""]
             for commit in git_info.recent_commits[:5]:  # Show top 5
-                sections.append(f"#### {commit['short_hash']} - {commit['message']}")
-                sections.append(f"**Author:** {commit['author']} | **Date:** {commit['date']}")
+                commit_lines += (
+                    f"#### {commit['short_hash']} - {commit['message']}",
+                    f"**Author:** {commit['author']} | **Date:** {commit['date']}"
+                )
                 
                 if commit['changed_files']:
-                    sections.append("**Changed Files:**")
-                    for file_path in commit['changed_files'][:10]:  # Limit to 10 files
-                        sections.append(f"- `{file_path}`")
-                sections.append("")
+                    commit_lines.append("**Changed Files:**")
+                    # Limit to 10 files
+                    commit_lines += [f"- `{file_path}`" for file_path in commit['changed_files'][:10]]
+                commit_lines.append("")
+            sections.append("\n".join(commit_lines))
         
         # Recently Changed Files
         if git_info.changed_files:
-            sections.append("### Recently Changed Files")
-            sections.append("")
-            for file_path in git_info.changed_files[:20]:  # Show up to 20 files
-                sections.append(f"- `{file_path}`")
-            sections.append("")
+            # Show up to 20 files
+            file_list = "\n".join([f"- `{file_path}`" for file_path in git_info.changed_files[:20]])
+            sections.append(f"### Recently Changed Files\n\n{file_list}\n")
         
         # Relevant Code Files
-        if diagnosis_response.diagnosis_result.relevant_code_files:
-            sections.append("## Relevant Code Files")
-            sections.append("")
-            sections.append("The following files are most likely related to this error:")
-            sections.append("")
-            
-            for file_item in diagnosis_response.diagnosis_result.relevant_code_files:
-                # Handle both string and dict formats
-                if isinstance(file_item, dict):
-                    file_path = file_item.get('file_path', str(file_item))
-                    size_kb = file_item.get('size_kb')
-                    selection_reason = file_item.get('selection_reason')
-                    snippets = file_item.get('snippets', [])
-                    
-                    # Display file with size and reason if available
-                    if size_kb and selection_reason:
-                        sections.append(f"- `{file_path}` ({size_kb:.1f}KB) - {selection_reason}")
-                    elif size_kb:
-                        sections.append(f"- `{file_path}` ({size_kb:.1f}KB)")
-                    elif selection_reason:
-                        sections.append(f"- `{file_path}` - {selection_reason}")
-                    else:
-                        sections.append(f"- `{file_path}`")
-                    
-                    # Include snippets if available
-                    if snippets and len(snippets) > 0:
-                        sections.append(f"  - {len(snippets)} relevant code snippet(s) identified")
-                        
-                elif isinstance(file_item, str):
-                    sections.append(f"- `{file_item}`")
-                else:
-                    # Handle FileContentInfo objects directly
-                    sections.append(f"- `{file_item.file_path}`")
-            
-            sections.append("")
+        if diagnosis_result.relevant_code_files:
+            file_list = "\n".join([
+                _relevant_file_entry(file_item) for file_item in diagnosis_result.relevant_code_files
+            ])
+            sections.append(
+                "## Relevant Code Files\n"
+                "\n"
+                "The following files are most likely related to this error:\n"
+                "\n"
+                f"{file_list}\n"
+            )
         
         # Recommendations
-        sections.append("## Recommendations")
-        sections.append("")
+        recommendation_lines = ["## Recommendations", ""]
         
         # Group and format recommendations properly
-        recommendations = self._format_recommendations(diagnosis_response.diagnosis_result.recommendations)
+        recommendations = self._format_recommendations(diagnosis_result.recommendations)
         
         for i, recommendation in enumerate(recommendations, 1):
-            sections.append(f"### {i}. {recommendation['title']}")
-            sections.append("")
+            recommendation_lines += (f"### {i}. {recommendation['title']}", "")
             if recommendation['content']:
-                sections.extend(recommendation['content'])
-                sections.append("")
-        
-        # Action Items
-        sections.append("## Action Items")
-        sections.append("")
-        sections.append("- [ ] Review the root cause analysis")
-        sections.append("- [ ] Implement immediate fixes")
-        sections.append("- [ ] Review relevant code files")
-        sections.append("- [ ] Update monitoring/alerts if needed")
-        sections.append("- [ ] Document lessons learned")
-        sections.append("")
-        
-        # Metadata
-        sections.append("---")
-        sections.append("")
-        sections.append("## Report Metadata")
-        sections.append("")
-        sections.append(f"- **Report File:** `{diagnosis_response.report_file_path}`")
-        sections.append(f"- **Diagnosis ID:** `{diagnosis_response.diagnosis_id}`")
-        sections.append(f"- **Log Dawg Version:** {self._get_version()}")
-        sections.append(f"- **Generated At:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}")
+                recommendation_lines += (*recommendation['content'], "")
+        sections.append("\n".join(recommendation_lines))
+        
+        # Action Items and Metadata
+        sections += (_ACTION_ITEMS, _METADATA_HEADER)
+        sections.append(
+            f"- **Report File:** `{diagnosis_response.report_file_path}`\n"
+            f"- **Diagnosis ID:** `{diagnosis_response.diagnosis_id}`\n"
+            f"- **Log Dawg Version:** {self._get_version()}\n"
+            f"- **Generated At:** {datetime.now():%Y-%m-%d %H:%M:%S UTC}"
+        )
         
         return "\n".join(sections)
     
     def _create_confidence_bar(self, confidence: float) -> str:
         """Create a visual confidence bar"""
         filled_blocks = int(confidence * 10)
-        empty_blocks = 10 - filled_blocks
-        
-        filled = "█" * filled_blocks
-        empty = "░" * empty_blocks
         
-        return f"[{filled}{empty}]"
+        # Clamp so out-of-range scores still render a 10-block bar
+        return _CONFIDENCE_BARS[min(max(filled_blocks, 0), 10)]
     
     def _format_recommendations(self, recommendations: list) -> list:
         """Format and group recommendations properly"""
         if not recommendations:
             return []
         
+        # A single item without a "." can't be split into sections, and one
+        # item alone never forms a titled group, so grouping would always
+        # fall through to the "Implementation Steps" fallback
+        if len(recommendations) == 1 and '.' not in recommendations[0]:
+            return [{
+                "title": "Implementation Steps",
+                "content": recommendations
+            }]
+        
         formatted_recommendations = []
         
         # Join all recommendations into a single text block for processing
         full_text = "\n".join(recommendations)
         
-        # Split by common recommendation indicators
-        import re
-        
-        # Look for patterns like ". **Fix" or numbered items starting with digits
-        # But be more careful about the regex pattern
-        sections = re.split(r'(?=\d*\.\s*\*?\*?[A-Z][^:]*:)', full_text)
-        
-        # If no clear sections found, treat each major chunk as a recommendation
-        if len(sections) <= 1:
-            # Try splitting on numbered recommendations differently
-            sections = re.split(r'(?=\d+\.\s*[A-Z])', full_text)
+        # Both split patterns need a literal "." (as in "1." or ". **"), so
+        # plain prose without one skips straight to the grouping fallback
+        sections = [full_text]
+        if '.' in full_text:
+            # Split by common recommendation indicators
+            # Look for patterns like ". **Fix" or numbered items starting with digits
+            # But be more careful about the regex pattern
+            sections = _RE_SECTION_SPLIT_A.split(full_text)
+            
+            # If no clear sections found, treat each major chunk as a recommendation
+            if len(sections) <= 1:
+                # Try splitting on numbered recommendations differently
+                sections = _RE_SECTION_SPLIT_B.split(full_text)
         
         # If still no sections, fallback to simple grouping
         if len(sections) <= 1:
@@ -285,7 +438,7 @@ class MarkdownReportWriter:
                     continue
                 
                 # Check if this looks like a title (starts with number/bullet and has colon or **bold**)
-                if (re.match(r'^\d*\.\s*\*?\*?[A-Z].*[:\*]', item) or 
+                if (_RE_IS_TITLE.match(item) or 
                     item.startswith('. **') or 
                     (len(item) < 50 and ':' in item)):
                     
@@ -297,8 +450,8 @@ class MarkdownReportWriter:
                         })
                     
                     # Start new group
-                    current_title = re.sub(r'^\d*\.\s*\*?\*?', '', item)
-                    current_title = re.sub(r'\*?\*?:?\s*$', '', current_title).strip()
+                    current_title = _RE_TITLE_PREFIX.sub('', item)
+                    current_title = _RE_TITLE_TRAILER.sub('', current_title).strip()
                     current_group = []
                 
                 else:
@@ -334,9 +487,9 @@ class MarkdownReportWriter:
                 first_line = lines[0]
                 
                 # Clean up numbering and formatting from title
-                title = re.sub(r'^\d*\.\s*', '', first_line)  # Remove "1. "
-                title = re.sub(r'^\*?\*?', '', title)  # Remove bold markers
-                title = re.sub(r'\*?\*?:?\s*$', '', title)  # Remove trailing markers
+                title = _RE_TITLE_NUMBER.sub('', first_line)  # Remove "1. "
+                title = _RE_TITLE_BOLD.sub('', title)  # Remove bold markers
+                title = _RE_TITLE_TRAILER.sub('', title)  # Remove trailing markers
                 title = title.strip()
                 
                 if not title or len(title) < 3:
@@ -349,26 +502,23 @@ class MarkdownReportWriter:
                 
                 # Join lines that might be part of the same logical unit
                 processed_lines = []
-                i = 0
-                while i < len(lines[1:]):  # Skip the title line
-                    line = lines[i + 1]  # +1 because we're skipping the title
-                    if not line:
-                        i += 1
-                        continue
+                tail = lines[1:]  # Skip the title line
+                n = len(tail)
+                j = 0
+                while j < n:
+                    line = tail[j]
                     
                     # Check if this line and the next should be joined (like broken printf statements)
-                    if (i + 2 < len(lines) and 
-                        line.endswith('"') == False and 
+                    if (j + 1 < n and
                         'printf(' in line and
-                        lines[i + 2].startswith('", ')):
+                        not line.endswith('"') and
+                        tail[j + 1].startswith('", ')):
                         # Join broken printf statement
-                        next_line = lines[i + 2]
-                        joined_line = line + '\\n' + next_line
-                        processed_lines.append(joined_line)
-                        i += 2  # Skip the next line since we've joined it
+                        processed_lines.append(line + '\\n' + tail[j + 1])
+                        j += 2  # Skip the next line since we've joined it
                     else:
                         processed_lines.append(line)
-                        i += 1
+                        j += 1
                 
                 # Now process the cleaned lines
                 for line in processed_lines:
@@ -376,19 +526,8 @@ class MarkdownReportWriter:
                         continue
                     
                     # Detect code patterns - be more specific about shell vs C
-                    is_c_code = (
-                        line.startswith(('//','if (','for (','printf(','```')) or
-                        line.endswith(('{',';')) or
-                        re.match(r'^\s*[a-zA-Z_][a-zA-Z0-9_]*\s*\(', line)  # function calls
-                    )
-                    
-                    is_shell_code = (
-                        line.startswith('#') and not line.startswith('# Example') or
-                        line.startswith('for ') and 'in ' in line and line.endswith(' do') or
-                        line.startswith(('echo ', 'cat ', 'ls ', 'cd ', 'if [', 'exit ', 'fi', 'done')) or
-                        line.strip() in ['fi', 'done'] or
-                        ('$' in line and any(cmd in line for cmd in ['echo', 'exit']))
-                    )
+                    is_c_code = _RE_IS_C_CODE.match(line) is not None
+                    is_shell_code = _RE_IS_SHELL_CODE.match(line) is not None
                     
                     is_code_line = is_c_code or is_shell_code
                     
@@ -405,10 +544,8 @@ class MarkdownReportWriter:
                         code_block.append(line)
                     elif not is_code_line and in_code:
                         # End code block
-                        content_lines.extend(code_block)
-                        content_lines.append("```")
-                        content_lines.append("")
-                        content_lines.append(line)
+                        content_lines += code_block
+                        content_lines += ("```", "", line)
                         in_code = False
                         code_block = []
                     else:
@@ -449,74 +586,161 @@ class MarkdownReportWriter:
         except ImportError:
             return "Unknown"
     
-    def _cleanup_old_reports(self):
-        """Clean up old reports if exceeding max limit"""
-        max_reports = self.config.reports.max_reports
+    def _scan_report_mtimes(self):
+        """Seed the report heap from the reports directory"""
+        with os.scandir(self.reports_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.md') and entry.is_file():
+                    self._report_mtimes[entry.name] = entry.stat().st_mtime_ns
+        self._report_heap = [(mtime, name) for name, mtime in self._report_mtimes.items()]
+        heapq.heapify(self._report_heap)
+    
+    def _cleanup_old_reports(self, filename: str, mtime_ns: int):
+        """Record a newly written report and remove the oldest ones beyond the max limit"""
+        max_reports = self._max_reports
         
         if max_reports <= 0:
             return
         
-        # Get all report files sorted by modification time
-        report_files = []
-        for file_path in self.reports_dir.glob("*.md"):
-            if file_path.is_file():
-                report_files.append((file_path.stat().st_mtime, file_path))
-        
-        # Sort by modification time (newest first)
-        report_files.sort(reverse=True)
-        
-        # Remove excess files
-        if len(report_files) > max_reports:
-            files_to_remove = report_files[max_reports:]
-            for _, file_path in files_to_remove:
+        with self._reports_lock:
+            self._report_mtimes[filename] = mtime_ns
+            heapq.heappush(self._report_heap, (mtime_ns, filename))
+            
+            # Remove excess files, oldest first
+            while len(self._report_mtimes) > max_reports:
+                mtime, name = heapq.heappop(self._report_heap)
+                if self._report_mtimes.get(name) != mtime:
+                    continue  # superseded by a newer write of the same file
+                del self._report_mtimes[name]
                 try:
-                    file_path.unlink()
-                    print(f"Removed old report: {file_path.name}")
+                    (self.reports_dir / name).unlink()
+                    print(f"Removed old report: {name}")
                 except Exception as e:
-                    print(f"Failed to remove old report {file_path.name}: {e}")
+                    print(f"Failed to remove old report {name}: {e}")
     
     def list_reports(self, limit: int = 20) -> list:
         """List recent reports with enhanced metadata"""
+        # One scandir pass collects names and stats; structured data is only
+        # loaded for the reports that make the cut
+        candidates = []
+        with os.scandir(self.reports_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.md') and entry.is_file():
+                    candidates.append((entry.stat(), entry.name, entry.path))
+        
+        # Sort by modification time (newest first)
+        candidates.sort(key=lambda candidate: candidate[0].st_mtime, reverse=True)
+        
         report_files = []
+        for stat, filename, path in candidates[:limit]:
+            display_info, extra_fields = self._listing_info(filename, stat.st_mtime_ns)
+            
+            report_info = {
+                "filename": filename,
+                "path": path,
+                "size_bytes": stat.st_size,
+                "modified": datetime.fromtimestamp(stat.st_mtime),
+                "created": datetime.fromtimestamp(stat.st_ctime),
+                "display_title": display_info["title"],
+                "error_type": display_info["error_type"], 
+                "confidence_score": display_info["confidence_score"],
+                "processing_time": display_info["processing_time"],
+                "summary_preview": display_info["summary_preview"]
+            }
+            
+            # Add diagnosis_id from structured data if available
+            report_info.update(extra_fields)
+            
+            report_files.append(report_info)
         
-        for file_path in self.reports_dir.glob("*.md"):
-            if file_path.is_file():
-                stat = file_path.stat()
-                
-                # Get structured data for enhanced display
-                structured_data = self.get_structured_data(file_path.name)
-                
-                # Generate display title and metadata
-                display_info = self._generate_display_info(file_path.name, structured_data)
-                
-                report_info = {
-                    "filename": file_path.name,
-                    "path": str(file_path),
-                    "size_bytes": stat.st_size,
-                    "modified": datetime.fromtimestamp(stat.st_mtime),
-                    "created": datetime.fromtimestamp(stat.st_ctime),
-                    "display_title": display_info["title"],
-                    "error_type": display_info["error_type"], 
-                    "confidence_score": display_info["confidence_score"],
-                    "processing_time": display_info["processing_time"],
-                    "summary_preview": display_info["summary_preview"]
-                }
-                
-                # Add diagnosis_id from structured data if available
-                if structured_data:
-                    report_info["diagnosis_id"] = structured_data.get("diagnosis_id")
-                
-                report_files.append(report_info)
+        return report_files
+    
+    def _listing_info(self, filename: str, mtime_ns: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Get display info and extra listing fields for a report, memoized per (filename, mtime)"""
+        key = (filename, mtime_ns)
+        with self._index_lock:
+            cached = self._display_cache.get(key)
+            if cached is not None:
+                self._display_cache.move_to_end(key)
+                return cached
+        
+        # Get structured data for enhanced display
+        structured_data = self.get_structured_data(filename)
         
-        # Sort by modification time (newest first)
-        report_files.sort(key=lambda x: x["modified"], reverse=True)
+        # Generate display title and metadata
+        display_info = self._generate_display_info(filename, structured_data)
+        if not structured_data:
+            # The sidecar may not be written yet; don't remember its absence
+            return display_info, {}
         
-        return report_files[:limit]
+        return self._remember_listing_info(key, display_info, structured_data.get("diagnosis_id"))
+    
+    def _remember_listing_info(
+        self,
+        key: Tuple[str, int],
+        display_info: Dict[str, Any],
+        diagnosis_id: Optional[str]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Cache listing info for a report and record it in the listing index"""
+        cached = (display_info, {"diagnosis_id": diagnosis_id})
+        with self._index_lock:
+            self._display_cache[key] = cached
+            self._display_cache.move_to_end(key)
+            if len(self._display_cache) > DISPLAY_CACHE_SIZE:
+                self._display_cache.popitem(last=False)
+            
+            try:
+                if self._index_lines >= 2 * DISPLAY_CACHE_SIZE:
+                    self._write_index()
+                else:
+                    with open(self.index_path, 'ab') as f:
+                        f.write(self._index_line(key, cached))
+                    self._index_lines += 1
+            except Exception as e:
+                print(f"Failed to update report index: {e}")
+        return cached
+    
+    def _index_line(self, key: Tuple[str, int], cached: Tuple[Dict[str, Any], Dict[str, Any]]) -> bytes:
+        """Serialize one listing index entry"""
+        return orjson.dumps(
+            {"filename": key[0], "mtime_ns": key[1], "display_info": cached[0], **cached[1]},
+            default=str,
+            option=orjson.OPT_APPEND_NEWLINE
+        )
+    
+    def _load_index(self):
+        """Seed the listing cache from the index; later lines win"""
+        try:
+            lines = self.index_path.read_bytes().splitlines()
+        except FileNotFoundError:
+            return
+        
+        for line in lines:
+            try:
+                entry = orjson.loads(line)
+                key = (entry["filename"], entry["mtime_ns"])
+                cached = (entry["display_info"], {"diagnosis_id": entry.get("diagnosis_id")})
+            except (orjson.JSONDecodeError, KeyError, TypeError):
+                # Skip a torn trailing line
+                continue
+            self._display_cache[key] = cached
+            self._display_cache.move_to_end(key)
+        
+        while len(self._display_cache) > DISPLAY_CACHE_SIZE:
+            self._display_cache.popitem(last=False)
+        self._index_lines = len(lines)
+    
+    def _write_index(self):
+        """Atomically replace the index with the cached entries"""
+        tmp_path = self.index_path.with_suffix('.jsonl.tmp')
+        with open(tmp_path, 'wb') as f:
+            for key, cached in self._display_cache.items():
+                f.write(self._index_line(key, cached))
+        os.replace(tmp_path, self.index_path)
+        self._index_lines = len(self._display_cache)
     
     def _generate_display_info(self, filename: str, structured_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate display-friendly information from structured data"""
-        import re
-        
         # Default fallback values
         display_info = {
             "title": filename.replace('.md', '').replace('_', ' ').title(),
@@ -561,8 +785,6 @@ class MarkdownReportWriter:
     
     def _extract_title_from_summary(self, summary: str) -> Optional[str]:
         """Extract a meaningful title from the summary text"""
-        import re
-        
         # Clean up the summary
         summary = summary.strip()
         if not summary:
@@ -605,33 +827,20 @@ class MarkdownReportWriter:
             return "Stack Overflow"
         
         # Look for specific error descriptions in the text
-        error_patterns = {
-            r'failed to (open|read|load|compile|initialize) (.+?)(?:\s|,|\.|$)': lambda m: f"Failed to {m.group(1).title()} {m.group(2).title()}",
-            r'cannot (open|read|load|find|access) (.+?)(?:\s|,|\.|$)': lambda m: f"Cannot {m.group(1).title()} {m.group(2).title()}",
-            r'missing (.+?)(?:\s|,|\.|$)': lambda m: f"Missing {m.group(1).title()}",
-            r'invalid (.+?)(?:\s|,|\.|$)': lambda m: f"Invalid {m.group(1).title()}",
-            r'corrupt(ed)? (.+?)(?:\s|,|\.|$)': lambda m: f"Corrupted {m.group(2).title()}",
-        }
-        
-        for pattern, title_func in error_patterns.items():
-            match = re.search(pattern, summary_lower)
+        for pattern, title_func in _TITLE_ERROR_PATTERNS:
+            match = pattern.search(summary_lower)
             if match:
                 title = title_func(match)
                 if len(title) <= 60:  # Keep it concise
                     return title
         
-        # Extract the main action/problem from the first sentence
-        sentences = re.split(r'[.!?]+', summary)
-        first_sentence = sentences[0].strip() if sentences else summary
+        # Extract the main action/problem from the first sentence (the rest
+        # of the summary is left unsplit)
+        first_sentence = _RE_SENTENCE_SPLIT.split(summary, maxsplit=1)[0].strip()
         
         # Clean up the first sentence to make it more title-like
-        first_sentence = re.sub(r'^(the\s+)?error\s+(occurs|arises|is)', 'Error', first_sentence, flags=re.IGNORECASE)
-        first_sentence = re.sub(r'^(the\s+)?log\s+(indicates|shows)', 'Log Analysis:', first_sentence, flags=re.IGNORECASE)
-        first_sentence = re.sub(r'^(the\s+)?issue\s+(is|occurs)', 'Issue:', first_sentence, flags=re.IGNORECASE)
-        
-        # Remove unnecessary words
-        first_sentence = re.sub(r'\s+(during|within|in\s+the)\s+', ' ', first_sentence, flags=re.IGNORECASE)
-        first_sentence = re.sub(r'\s+specifically\s+', ' ', first_sentence, flags=re.IGNORECASE)
+        for pattern, replacement in _TITLE_REWRITES:
+            first_sentence = pattern.sub(replacement, first_sentence)
         
         # Limit length and clean up
         if len(first_sentence) > 60:
@@ -650,10 +859,8 @@ class MarkdownReportWriter:
     
     def _generate_summary_preview(self, summary: str) -> str:
         """Generate a short preview from the summary"""
-        import re
-        
-        # Get first 2 sentences
-        sentences = re.split(r'[.!?]+', summary.strip())
+        # Get first 2 sentences (the remainder is left unsplit)
+        sentences = _RE_SENTENCE_SPLIT.split(summary.strip(), maxsplit=2)
         preview_sentences = []
         
         for sentence in sentences[:2]:
@@ -695,25 +902,25 @@ class MarkdownReportWriter:
         filename: str, 
         diagnosis_response: LogDiagnosisResponse, 
         parsed_log: ParsedLogEntry
-    ):
-        """Save structured data alongside markdown report"""
-        # Create JSON filename (same as markdown but with .json extension)
-        json_filename = filename.replace('.md', '.json')
-        json_path = self.reports_dir / json_filename
+    ) -> Optional[Dict[str, Any]]:
+        """Save structured data alongside markdown report, returning it on success"""
+        # JSON sidecar path (same as markdown but with .json extension)
+        json_path = _sidecar_path(self.reports_dir, filename)
         
         # Convert to serializable format
+        result = diagnosis_response.diagnosis_result
         structured_data = {
             "diagnosis_id": diagnosis_response.diagnosis_id,
-            "timestamp": diagnosis_response.timestamp.isoformat(),
+            "timestamp": diagnosis_response.timestamp,
             "processing_time_seconds": diagnosis_response.processing_time_seconds,
             "diagnosis_result": {
-                "title": getattr(diagnosis_response.diagnosis_result, 'title', 'Error Analysis'),
-                "error_type": getattr(diagnosis_response.diagnosis_result, 'error_type', 'Runtime Error'),
-                "summary": diagnosis_response.diagnosis_result.summary,
-                "root_cause": diagnosis_response.diagnosis_result.root_cause,
-                "error_analysis": diagnosis_response.diagnosis_result.error_analysis,
-                "recommendations": diagnosis_response.diagnosis_result.recommendations,
-                "confidence_score": diagnosis_response.diagnosis_result.confidence_score,
+                "title": result.title,
+                "error_type": result.error_type,
+                "summary": result.summary,
+                "root_cause": result.root_cause,
+                "error_analysis": result.error_analysis,
+                "recommendations": result.recommendations,
+                "confidence_score": result.confidence_score,
                 "relevant_code_files": [
                     {
                         "file_path": f.file_path,
@@ -724,18 +931,18 @@ class MarkdownReportWriter:
                                 "end_line": snippet.end_line,
                                 "content": snippet.content
                             }
-                            for snippet in (f.snippets or [])
+                            for snippet in f.snippets or ()
                         ],
                         "relevance_score": f.relevance_score,
                         "selection_reason": f.selection_reason
                     }
-                    for f in (diagnosis_response.diagnosis_result.relevant_code_files or [])
+                    for f in result.relevant_code_files or ()
                 ]
             },
             "git_info": {
                 "branch": diagnosis_response.git_info.branch,
                 "current_commit": diagnosis_response.git_info.current_commit,
-                "last_pull_time": diagnosis_response.git_info.last_pull_time.isoformat(),
+                "last_pull_time": diagnosis_response.git_info.last_pull_time,
                 "recent_commits": diagnosis_response.git_info.recent_commits,
                 "changed_files": diagnosis_response.git_info.changed_files
             },
@@ -751,23 +958,49 @@ class MarkdownReportWriter:
         }
         
         try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(structured_data, f, indent=2, ensure_ascii=False, default=str)
+            # orjson serializes straight to UTF-8 bytes; only the write itself
+            # is handed to the IO worker
+            payload = orjson.dumps(structured_data, default=str, option=_ORJSON_OPTIONS)
+            with self._pending_lock:
+                self._pending_sidecars[json_path] = payload
+            self._io_pool.submit(self._write_structured_data, filename, json_path, payload)
         except Exception as e:
             print(f"Failed to save structured data for {filename}: {e}")
+            return None
+        
+        return structured_data
+    
+    def _write_structured_data(self, filename: str, json_path: Path, payload: bytes):
+        """Write a serialized sidecar; readers never see a partial file"""
+        try:
+            _replace_file(json_path, payload)
+        except Exception as e:
+            print(f"Failed to save structured data for {filename}: {e}")
+        finally:
+            with self._pending_lock:
+                # A newer payload for the same file may have been queued since
+                if self._pending_sidecars.get(json_path) is payload:
+                    del self._pending_sidecars[json_path]
     
     def get_structured_data(self, filename: str) -> Optional[Dict[str, Any]]:
         """Get structured data for a specific report"""
-        json_filename = filename.replace('.md', '.json')
-        json_path = self.reports_dir / json_filename
+        json_path = _sidecar_path(self.reports_dir, filename)
         
-        if not json_path.exists():
-            return None
+        # A sidecar still queued for writing is served from memory
+        with self._pending_lock:
+            payload = self._pending_sidecars.get(json_path)
+        if payload is not None:
+            return orjson.loads(payload)
         
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except json.JSONDecodeError as e:
+            with open(json_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < SIDECAR_MMAP_THRESHOLD:
+                    return orjson.loads(f.read())
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    return orjson.loads(view)
+        except FileNotFoundError:
+            return None
+        except orjson.JSONDecodeError as e:
             print(f"Error reading structured data for {filename}: Invalid JSON - {e}")
             return None
         except Exception as e:
@@ -789,11 +1022,84 @@ class MarkdownReportWriter:
             "timestamp": datetime.now().isoformat()
         }
 
+    def _confidence_scores(self, report_stats: List[Tuple[str, os.stat_result]]) -> List[Optional[float]]:
+        """Get each report's confidence score from the listing cache, falling back to its sidecar"""
+        # Plain lookups: stats passes shouldn't reorder or grow the listing cache
+        with self._index_lock:
+            cached = [self._display_cache.get((filename, stat.st_mtime_ns)) for filename, stat in report_stats]
+        
+        scores = [entry[0]["confidence_score"] if entry is not None else None for entry in cached]
+        misses = [i for i, entry in enumerate(cached) if entry is None]
+        if len(misses) > 1:
+            read_scores = self._read_pool.map(self._sidecar_confidence_score, [report_stats[i][0] for i in misses])
+        else:
+            read_scores = [self._sidecar_confidence_score(report_stats[i][0]) for i in misses]
+        for i, score in zip(misses, read_scores):
+            scores[i] = score
+        return scores
+    
+    def _sidecar_confidence_score(self, filename: str) -> Optional[float]:
+        """Read a report's confidence score from its JSON sidecar"""
+        # Scan for the one field stats need rather than parsing the whole
+        # sidecar; anything unexpected falls back to the full parse
+        json_path = _sidecar_path(self.reports_dir, filename)
+        with self._pending_lock:
+            payload = self._pending_sidecars.get(json_path)
+        
+        try:
+            if payload is not None:
+                match = _RE_CONFIDENCE_SCORE.search(payload)
+                score = match and match.group(1)
+            else:
+                with open(json_path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size < SIDECAR_MMAP_THRESHOLD:
+                        match = _RE_CONFIDENCE_SCORE.search(f.read())
+                        score = match and match.group(1)
+                    else:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                            match = _RE_CONFIDENCE_SCORE.search(mapped)
+                            score = match and match.group(1)
+            if score:
+                return float(score)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            pass
+        
+        structured_data = self.get_structured_data(filename)
+        if structured_data:
+            return structured_data.get('diagnosis_result', {}).get('confidence_score')
+        return None
+    
     def get_report_stats(self) -> Dict[str, Any]:
         """Get statistics about reports"""
-        report_files = list(self.reports_dir.glob("*.md"))
+        # Adding, removing or replacing a report (or its sidecar) bumps the
+        # directory mtime; the date is part of the key for reports_today
+        today = datetime.now().date()
+        dir_mtime_ns = os.stat(self.reports_dir).st_mtime_ns
+        key = (dir_mtime_ns, today)
+        
+        cached = self._stats_cache
+        if cached is not None and cached[0] == key:
+            return dict(cached[1])
         
-        if not report_files:
+        stats = self._compute_report_stats(today)
+        if time.time_ns() - dir_mtime_ns >= STATS_CACHE_SETTLE_SECONDS * 1_000_000_000:
+            self._stats_cache = (key, stats)
+        return dict(stats)
+    
+    def _compute_report_stats(self, today) -> Dict[str, Any]:
+        """Compute statistics about reports from the reports directory"""
+        # One scandir pass; each DirEntry's stat is reused for sizes, times
+        # and cache lookups
+        with os.scandir(self.reports_dir) as entries:
+            report_stats = [
+                (entry.name, entry.stat())
+                for entry in entries
+                if entry.name.endswith('.md') and entry.is_file()
+            ]
+        
+        if not report_stats:
             return {
                 "total_reports": 0,
                 "total_size_mb": 0,
@@ -803,32 +1109,43 @@ class MarkdownReportWriter:
                 "average_confidence_score": 0
             }
         
-        total_size = sum(f.stat().st_size for f in report_files)
-        modification_times = [f.stat().st_mtime for f in report_files]
+        confidence_scores = self._confidence_scores(report_stats)
         
-        # Calculate reports today and average confidence
-        today = datetime.now().date()
+        # Single pass accumulating size, mtime bounds, today's count and
+        # confidence scores
+        total_size = 0
+        oldest_mtime = newest_mtime = report_stats[0][1].st_mtime
         reports_today = 0
-        confidence_scores = []
-        
-        for report_file in report_files:
+        # Local-midnight bounds for today, so the per-report check is a float
+        # comparison (next midnight rather than +86400 to respect DST)
+        today_start = datetime.combine(today, datetime.min.time()).timestamp()
+        today_end = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+        confidence_total = 0.0
+        confidence_count = 0
+        
+        for (_, stat), confidence_score in zip(report_stats, confidence_scores):
+            total_size += stat.st_size
+            mtime = stat.st_mtime
+            if mtime < oldest_mtime:
+                oldest_mtime = mtime
+            elif mtime > newest_mtime:
+                newest_mtime = mtime
+            
             # Check if report was created today
-            file_date = datetime.fromtimestamp(report_file.stat().st_ctime).date()
-            if file_date == today:
+            if today_start <= stat.st_ctime < today_end:
                 reports_today += 1
             
-            # Try to get confidence score from structured data
-            structured_data = self.get_structured_data(report_file.name)
-            if structured_data and structured_data.get('diagnosis_result', {}).get('confidence_score'):
-                confidence_scores.append(structured_data['diagnosis_result']['confidence_score'])
+            if confidence_score:
+                confidence_total += confidence_score
+                confidence_count += 1
         
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
+        avg_confidence = confidence_total / confidence_count if confidence_count else 0
         
         return {
-            "total_reports": len(report_files),
+            "total_reports": len(report_stats),
             "total_size_mb": total_size / (1024 * 1024),
-            "oldest_report": datetime.fromtimestamp(min(modification_times)),
-            "newest_report": datetime.fromtimestamp(max(modification_times)),
+            "oldest_report": datetime.fromtimestamp(oldest_mtime),
+            "newest_report": datetime.fromtimestamp(newest_mtime),
             "reports_today": reports_today,
             "average_confidence_score": round(avg_confidence * 100, 1)  # Convert to percentage
         }